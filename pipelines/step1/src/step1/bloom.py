@@ -0,0 +1,60 @@
+"""Small persistent Bloom filter for set-membership checks on identifiers."""
+
+import hashlib
+import math
+from typing import Iterator, Optional
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+
+    Bit positions come from double hashing one blake2b digest, so the
+    on-disk bit array stays valid across runs and Python versions (unlike
+    the salted built-in ``hash``).
+    """
+
+    def __init__(
+        self, capacity: int = 10000, error_rate: float = 0.01, bits: Optional[bytes] = None
+    ):
+        """Initialize the filter.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false-positive rate at capacity
+            bits: Existing bit array (see to_bytes), or None for an empty filter
+        """
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        size = (self.num_bits + 7) // 8
+
+        if bits is None:
+            self.bits = bytearray(size)
+        elif len(bits) == size:
+            self.bits = bytearray(bits)
+        else:
+            raise ValueError(f"Expected {size} bytes of filter state, got {len(bits)}")
+
+    def _positions(self, key: str) -> Iterator[int]:
+        """Yield the bit positions for a key."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        """Add a key to the filter.
+
+        Args:
+            key: Key to add
+        """
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if the key may have been added (False means definitely not)."""
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def to_bytes(self) -> bytes:
+        """Return the bit array for persisting the filter."""
+        return bytes(self.bits)
@@ -1,23 +1,54 @@
-"""Cache module for setting up requests-cache with SQLite backend."""
+"""Cache module for setting up requests-cache with a filesystem backend."""
 import requests_cache
-import os
+from requests_cache import SerializerPipeline, Stage, pickle_serializer
+from pathlib import Path
+import zlib
+from .config import settings
+
+
+# Default cache location, anchored to the step1 pipeline directory rather
+# than the working directory
+DEFAULT_HTTP_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "http_cache"
+
+
+# Pickle the cached responses, then zlib-compress them. EFetch XML bodies are
+# MB-scale and compress well, which keeps both the cache files and the
+# per-hit read/deserialize cost proportional to the compressed size.
+compressed_serializer = SerializerPipeline(
+    [
+        pickle_serializer,
+        Stage(dumps=zlib.compress, loads=zlib.decompress),
+    ],
+    is_binary=True,
+)
 
 
 def setup_cache():
-    """Set up requests-cache with SQLite backend.
-    
+    """Set up requests-cache with a filesystem backend.
+
+    Each response is stored in its own file, so a cache hit is a single
+    file read regardless of how large the cache grows (unlike SQLite).
+    The cache lives in settings.http_cache_dir, or DEFAULT_HTTP_CACHE_DIR.
+
     Returns:
         requests_cache.CachedSession: Configured cache session
     """
-    cache_path = os.path.join("data", "http_cache.sqlite")
+    cache_path = Path(settings.http_cache_dir or DEFAULT_HTTP_CACHE_DIR)
     session = requests_cache.CachedSession(
         cache_path,
-        backend="sqlite",
+        backend="filesystem",
+        serializer=compressed_serializer,
         expire_after=3600,  # 1 hour
         allowable_codes=[200],
         allowable_methods=["GET", "POST"],
         stale_if_error=True,
     )
+    # The session is shared module-wide, so connections are kept alive
+    # across requests; ask servers for compressed bodies on the wire too
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "User-Agent": "PodcastGen/1.0",
+    })
     return session
 
 
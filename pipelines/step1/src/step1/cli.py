@@ -1,8 +1,10 @@
 """CLI entrypoint for the RCT podcast pipeline."""
 import typer
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 import json
+import string
+import msgspec
 from datetime import datetime
 import logging
 from .config import settings
@@ -12,9 +14,46 @@ from .scoring import score_articles, sort_articles_by_score
 from .select import select_top_article, widen_search_if_needed, record_selected_article
 from .model import Article
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = typer.Typer()
 logger = logging.getLogger(__name__)
 
+# Machine-readable handoff for later steps; JSON stays for human review
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder()
+_MSGPACK_DECODER = msgspec.msgpack.Decoder(List[Article])
+
+# Markdown card written for the selected article (see generate_markdown_card)
+_CARD_TPL = string.Template("""---
+title: "$title"
+journal: "$journal"
+date: "$pub_date"
+doi: "$doi"
+pmid: "$pmid"
+score: $score
+rationale: "$rationale"
+---
+**Design:** randomized (parallel/crossover), (multi)center, sample size ~$sample_size.  
+**Population:** ...  
+**Intervention vs comparator:** $intervention vs $comparator  
+**Primary outcome:** $primary_outcome  
+**Key result:** $effect_summary  
+**Why it matters (peri-op):** 2–3 bullet points for clinicians.  
+**Caveats:** 2–3 bullet points (bias, generalizability, power).
+""")
+
+# Anesthesia/perioperative RCT search, wrapped with any extra terms by
+# create_pubmed_query
+_BASE_QUERY = (
+    "(anesthesia OR anaesthesia OR anesthesiology OR perioperative OR "
+    "peri-operative OR \"perioperative care\" OR \"regional anesthesia\" OR "
+    "airway OR intubation OR \"nerve block\" OR analgesia) AND "
+    "(randomized OR randomised)"
+)
+
 
 def setup_logging():
     """Set up basic logging configuration."""
@@ -25,27 +64,44 @@ def setup_logging():
 
 
 def save_articles(articles: list, filename: str):
-    """Save articles to a JSON file.
+    """Save articles to a JSON file plus a MessagePack copy.
+    
+    The ``.msgpack`` file next to the JSON one is the handoff read by later
+    steps (see load_articles).
     
     Args:
         articles: List of articles to save
         filename: Name of file to save to
     """
     # Convert Article objects to dictionaries
-    articles_dict = []
-    for article in articles:
-        if isinstance(article, Article):
-            articles_dict.append(article.dict())
-        else:
-            articles_dict.append(article)
+    articles_dict = [msgspec.to_builtins(a) if isinstance(a, Article) else a for a in articles]
     
     filepath = Path("data") / filename
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(articles_dict, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        # orjson emits UTF-8 directly, so no ensure_ascii pass is needed
+        filepath.write_bytes(orjson.dumps(articles_dict, option=orjson.OPT_INDENT_2))
+    else:
+        filepath.write_text(
+            json.dumps(articles_dict, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+    filepath.with_suffix(".msgpack").write_bytes(_MSGPACK_ENCODER.encode(articles_dict))
     
     logger.info(f"Saved {len(articles)} articles to {filepath}")
 
 
+def load_articles(filename: str) -> List[Article]:
+    """Load articles from the MessagePack copy written by save_articles.
+    
+    Args:
+        filename: Name of the JSON or msgpack file under data/
+        
+    Returns:
+        List of decoded articles
+    """
+    filepath = (Path("data") / filename).with_suffix(".msgpack")
+    return _MSGPACK_DECODER.decode(filepath.read_bytes())
+
+
 def generate_markdown_card(article: Article, rationale: str):
     """Generate a markdown card for the selected article.
     
@@ -54,28 +110,24 @@ def generate_markdown_card(article: Article, rationale: str):
         rationale: Selection rationale
     """
     # Create markdown content
-    content = f"""---
-title: "{article.title}"
-journal: "{article.journal}"
-date: "{article.pub_date}"
-doi: "{article.doi or ''}"
-pmid: "{article.pmid}"
-score: {article.score}
-rationale: "{rationale}"
----
-**Design:** randomized (parallel/crossover), (multi)center, sample size ~{article.sample_size or 'N/A'}.  
-**Population:** ...  
-**Intervention vs comparator:** {article.intervention} vs {article.comparator}  
-**Primary outcome:** {article.primary_outcome}  
-**Key result:** {article.effect_summary or '...'}  
-**Why it matters (peri-op):** 2–3 bullet points for clinicians.  
-**Caveats:** 2–3 bullet points (bias, generalizability, power).
-"""
+    content = _CARD_TPL.substitute(
+        title=article.title,
+        journal=article.journal,
+        pub_date=article.pub_date,
+        doi=article.doi or '',
+        pmid=article.pmid,
+        score=article.score,
+        rationale=rationale,
+        sample_size=article.sample_size or 'N/A',
+        intervention=article.intervention,
+        comparator=article.comparator,
+        primary_outcome=article.primary_outcome,
+        effect_summary=article.effect_summary or '...',
+    )
 
     # Save to file
     filepath = Path("out") / "rct_card.md"
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(content)
+    filepath.write_text(content, encoding="utf-8")
     
     logger.info(f"Generated markdown card at {filepath}")
 
@@ -89,17 +141,10 @@ def create_pubmed_query(extra_query: Optional[str] = None) -> str:
     Returns:
         PubMed search query string
     """
-    base_query = (
-        "(anesthesia OR anaesthesia OR anesthesiology OR perioperative OR "
-        "peri-operative OR \"perioperative care\" OR \"regional anesthesia\" OR "
-        "airway OR intubation OR \"nerve block\" OR analgesia) AND "
-        "(randomized OR randomised)"
-    )
-    
     if extra_query:
-        return f"({base_query}) AND ({extra_query})"
+        return f"({_BASE_QUERY}) AND ({extra_query})"
     
-    return base_query
+    return _BASE_QUERY
 
 
 @app.command()
@@ -175,8 +220,8 @@ def fetch(
         typer.echo("Failed to fetch article details.")
         raise typer.Exit(code=1)
     
-    # Convert to Article objects
-    articles = [Article(**article_data) for article_data in articles_data]
+    # Convert to Article objects (msgspec validates field types in C)
+    articles = [msgspec.convert(article_data, Article) for article_data in articles_data]
     logger.info(f"Fetched {len(articles)} articles")
     
     # Filter articles
@@ -189,7 +234,7 @@ def fetch(
             pmids = pubmed_client.search_articles(query, max_results, 365)
             if pmids:
                 articles_data = pubmed_client.fetch_article_details(pmids)
-                articles = [Article(**article_data) for article_data in articles_data]
+                articles = [msgspec.convert(article_data, Article) for article_data in articles_data]
                 filtered_articles = filter_articles(articles)
         
         if not filtered_articles:
@@ -208,6 +253,7 @@ def fetch(
     save_articles(sorted_articles, candidates_filename)
     
     # Select top article, avoiding previously selected ones unless explicitly allowed
+    # (history avoidance needs the full ranking, not just the top few)
     selection_result = select_top_article(sorted_articles, avoid_history=not allow_repeat)
     if not selection_result:
         typer.echo("No articles available for selection.")
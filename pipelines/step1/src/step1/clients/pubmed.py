@@ -1,14 +1,88 @@
 """PubMed E-utilities client for searching and fetching articles."""
 import requests
-from typing import List, Dict, Optional
-from xml.etree import ElementTree as ET
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional
 from ..cache import cache_session
 from ..config import settings
+import re
+import threading
 import time
 import logging
 
+try:
+    # libxml2-backed parser; the find/findall/XMLPullParser API used here matches
+    # the stdlib one, so fall back to ElementTree when lxml is not installed
+    from lxml import etree as ET
+except ImportError:
+    from xml.etree import ElementTree as ET
+
 logger = logging.getLogger(__name__)
 
+# Number of PMIDs sent per EFetch request
+EFETCH_BATCH_SIZE = 200
+
+# Maximum number of EFetch requests in flight at once
+EFETCH_MAX_WORKERS = 4
+
+# NCBI allows 3 requests per second without an API key (10 with one)
+NCBI_REQUESTS_PER_SECOND = 3
+
+# Four-digit publication year, found in either PubDate/Year or a free-text
+# PubDate/MedlineDate such as "2024 Jan-Mar"
+_YEAR_RE = re.compile(r"(?:19|20)\d{2}")
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting how many requests start per second."""
+    
+    def __init__(self, rate: float):
+        """Initialize the limiter.
+        
+        Args:
+            rate: Allowed requests per second (also the burst size)
+        """
+        self.rate = rate
+        self.capacity = max(1.0, float(rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a request may be issued."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter that takes a rate-limiter token per request sent.
+    
+    Mounted on the cached session, it only sees requests that go out to the
+    network: cache hits are answered before the adapter is reached.
+    """
+    
+    def __init__(self, rate_limiter: RateLimiter, **kwargs):
+        """Initialize the adapter.
+        
+        Args:
+            rate_limiter: Limiter shared by every request through this adapter
+        """
+        super().__init__(**kwargs)
+        self.rate_limiter = rate_limiter
+    
+    def send(self, request, **kwargs):
+        """Wait for a token, then send the request."""
+        self.rate_limiter.acquire()
+        return super().send(request, **kwargs)
+
 
 class PubMedClient:
     """Client for interacting with PubMed E-utilities API."""
@@ -17,6 +91,9 @@ class PubMedClient:
         """Initialize the PubMed client with cache session."""
         self.session = cache_session
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+        self.rate_limiter = RateLimiter(NCBI_REQUESTS_PER_SECOND)
+        # Throttle only real E-utilities requests, not local cache reads
+        self.session.mount(self.base_url, RateLimitedAdapter(self.rate_limiter))
     
     def search_articles(
         self, 
@@ -73,33 +150,92 @@ class PubMedClient:
         if len(pmids) > 10000:
             pmids = pmids[:10000]
             
-        params = {
+        # Small POST batches keep request bodies short and let responses for
+        # different batches download and parse concurrently
+        batches = [
+            pmids[i:i + EFETCH_BATCH_SIZE] for i in range(0, len(pmids), EFETCH_BATCH_SIZE)
+        ]
+        
+        url = f"{self.base_url}/efetch.fcgi"
+        logger.info(f"Fetching details for {len(pmids)} articles in {len(batches)} batches")
+        
+        articles = []
+        with ThreadPoolExecutor(max_workers=min(EFETCH_MAX_WORKERS, len(batches))) as executor:
+            # map() yields results in submission order, preserving PMID order
+            for batch_articles in executor.map(self._fetch_batch, [url] * len(batches), batches):
+                articles.extend(batch_articles)
+        
+        logger.info(f"Parsed {len(articles)} articles")
+        return articles
+    
+    def _fetch_batch(self, url: str, pmids: List[str]) -> List[Dict]:
+        """Fetch and parse one EFetch batch.
+        
+        Args:
+            url: EFetch endpoint URL
+            pmids: PubMed IDs in this batch
+            
+        Returns:
+            List of article details
+        """
+        data = {
             "db": "pubmed",
             "id": ",".join(pmids),
             "retmode": "xml"
         }
         
-        url = f"{self.base_url}/efetch.fcgi"
-        logger.info(f"Fetching details for {len(pmids)} articles")
-        
-        response = self.session.get(url, params=params)
+        # The cached session reads the whole body to store it (or to load a
+        # cache hit), so there is nothing to gain from streaming it here
+        response = self.session.post(url, data=data)
         response.raise_for_status()
+        return self._parse_efetch_xml([response.content])
+    
+    def _parse_efetch_xml(self, chunks: Iterable[bytes]) -> List[Dict]:
+        """Incrementally parse an EFetch XML payload.
+        
+        Chunks are fed to a pull parser. Each PubmedArticle is parsed as soon
+        as its end tag is read and then cleared, so the full document tree is
+        never built.
         
-        # Parse XML response
-        root = ET.fromstring(response.content)
+        Args:
+            chunks: EFetch response body as an iterable of byte chunks
+            
+        Returns:
+            List of article details
+        """
         articles = []
+        parser = ET.XMLPullParser(events=("end",))
         
-        for article in root.findall(".//PubmedArticle"):
-            parsed_article = self._parse_article(article)
+        for chunk in chunks:
+            parser.feed(chunk)
+            self._collect_articles(parser, articles)
+        
+        parser.close()
+        self._collect_articles(parser, articles)
+        return articles
+    
+    def _collect_articles(self, parser, articles: List[Dict]) -> None:
+        """Parse every PubmedArticle the pull parser has finished so far.
+        
+        Args:
+            parser: XMLPullParser fed with EFetch XML
+            articles: List the parsed article details are appended to
+        """
+        for _, elem in parser.read_events():
+            if elem.tag != "PubmedArticle":
+                continue
+            parsed_article = self._parse_article(elem)
             if parsed_article:
                 articles.append(parsed_article)
-                
-        logger.info(f"Parsed {len(articles)} articles")
-        return articles
+            elem.clear()
     
     def _parse_article(self, article_xml) -> Optional[Dict]:
         """Parse a single article from XML.
         
+        Fields are looked up with fixed paths from the PubmedArticle element
+        rather than descendant (``.//``) queries, which scan the whole subtree
+        and can pick up IDs from reference lists.
+        
         Args:
             article_xml: XML element for a single article
             
@@ -108,28 +244,32 @@ class PubMedClient:
         """
         try:
             # Extract PMID
-            pmid_elem = article_xml.find(".//PMID")
+            pmid_elem = article_xml.find("MedlineCitation/PMID")
             pmid = pmid_elem.text if pmid_elem is not None else ""
             
             # Extract title
-            title_elem = article_xml.find(".//ArticleTitle")
+            title_elem = article_xml.find("MedlineCitation/Article/ArticleTitle")
             title = title_elem.text if title_elem is not None else ""
             
             # Extract abstract
-            abstract_elem = article_xml.find(".//AbstractText")
+            abstract_elem = article_xml.find("MedlineCitation/Article/Abstract/AbstractText")
             abstract = abstract_elem.text if abstract_elem is not None else ""
             
             # Extract journal
-            journal_elem = article_xml.find(".//Journal/Title")
+            journal_elem = article_xml.find("MedlineCitation/Article/Journal/Title")
             journal = journal_elem.text if journal_elem is not None else ""
             
             # Extract publication date
-            pub_date_elem = article_xml.find(".//PubDate/Year")
-            year = pub_date_elem.text if pub_date_elem is not None else ""
+            pub_date_elem = article_xml.find(
+                "MedlineCitation/Article/Journal/JournalIssue/PubDate"
+            )
+            pub_date_text = "".join(pub_date_elem.itertext()) if pub_date_elem is not None else ""
+            year_match = _YEAR_RE.search(pub_date_text)
+            year = year_match.group(0) if year_match else ""
             
             # Extract authors
             authors = []
-            for author_elem in article_xml.findall(".//Author"):
+            for author_elem in article_xml.findall("MedlineCitation/Article/AuthorList/Author"):
                 last_name = author_elem.find("LastName")
                 first_name = author_elem.find("ForeName")
                 if last_name is not None and first_name is not None:
@@ -138,17 +278,19 @@ class PubMedClient:
                     authors.append(last_name.text)
             
             # Extract DOI
-            doi_elem = article_xml.find(".//ArticleId[@IdType='doi']")
+            doi_elem = article_xml.find("PubmedData/ArticleIdList/ArticleId[@IdType='doi']")
             doi = doi_elem.text if doi_elem is not None else None
             
             # Extract MeSH terms
             mesh_terms = []
-            for mesh_elem in article_xml.findall(".//MeshHeading/DescriptorName"):
+            for mesh_elem in article_xml.findall(
+                "MedlineCitation/MeshHeadingList/MeshHeading/DescriptorName"
+            ):
                 if mesh_elem.text:
                     mesh_terms.append(mesh_elem.text)
             
             # Extract language
-            language_elem = article_xml.find(".//Language")
+            language_elem = article_xml.find("MedlineCitation/Article/Language")
             language = language_elem.text if language_elem is not None else "English"
             
             return {
@@ -157,12 +299,18 @@ class PubMedClient:
                 "abstract": abstract,
                 "authors": authors,
                 "journal": journal,
-                "year": int(year) if year.isdigit() else 0,
+                "year": int(year) if year else 0,
                 "pub_date": year,
                 "doi": doi,
                 "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" if pmid else "",
                 "language": language,
-                "mesh_terms": mesh_terms
+                "mesh_terms": mesh_terms,
+                # Study details are not available from EFetch metadata; emit
+                # them so the record matches the Article model field set
+                "trial_design": "",
+                "intervention": "",
+                "comparator": "",
+                "primary_outcome": ""
             }
         except Exception as e:
             logger.error(f"Error parsing article: {e}")
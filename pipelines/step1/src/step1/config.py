@@ -26,6 +26,9 @@ class Settings(BaseSettings):
     # Extra query terms to add to the search
     extra_query: Optional[str] = Field(default=None, env="EXTRA_QUERY")
     
+    # Directory of the HTTP response cache (default: pipelines/step1/data/http_cache)
+    http_cache_dir: Optional[str] = Field(default=None, env="HTTP_CACHE_DIR")
+    
     class Config:
         """Pydantic configuration."""
         env_file = ".env"
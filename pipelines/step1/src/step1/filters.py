@@ -3,6 +3,57 @@ import re
 from typing import List
 from .model import Article
 from .config import settings
+from .parallel import map_articles
+
+
+# Keyword sets used by the filters
+PREFERRED_LANGUAGES = frozenset({"english", "french"})
+
+RCT_TITLE_KEYWORDS = ["randomized", "randomised", "randomized controlled trial", "rct"]
+
+RCT_ABSTRACT_KEYWORDS = [
+    "randomized", "randomised", "randomly assigned", 
+    "controlled trial", "clinical trial", "double blind",
+    "placebo", "allocation", "intervention group"
+]
+
+HUMAN_KEYWORDS = ["human", "clinical", "patient", "volunteer", "randomized controlled trial"]
+
+ANIMAL_KEYWORDS = ["mouse", "rat", "animal", "mice", "rodent"]
+
+ANESTHESIA_KEYWORDS = [
+    "anesthesia", "anaesthesia", "anesthesiology", "perioperative", 
+    "peri-operative", "regional anesthesia", "airway", "intubation", 
+    "nerve block", "analgesia", "surgery", "operative", "surgical"
+]
+
+PROTOCOL_KEYWORDS = [
+    "protocol", "study protocol", "letter", "editorial", 
+    "commentary", "correspondence", "discussion"
+]
+
+PEDIATRIC_KEYWORDS = [
+    "pediatric", "paediatric", "child", "infant", "neonate", 
+    "newborn", "adolescent", "children", "kids", "under 18"
+]
+
+
+def _compile_keywords(keywords: List[str]) -> re.Pattern:
+    """Compile a keyword list into a single case-insensitive alternation.
+    
+    Keywords keep their substring semantics (no word boundaries), so a
+    search is equivalent to ``any(k in text.lower() for k in keywords)``.
+    """
+    return re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
+
+
+_RCT_TITLE_RE = _compile_keywords(RCT_TITLE_KEYWORDS)
+_RCT_ABSTRACT_RE = _compile_keywords(RCT_ABSTRACT_KEYWORDS)
+_HUMAN_RE = _compile_keywords(HUMAN_KEYWORDS)
+_ANIMAL_RE = _compile_keywords(ANIMAL_KEYWORDS)
+_ANESTH_RE = _compile_keywords(ANESTHESIA_KEYWORDS)
+_PROTOCOL_RE = _compile_keywords(PROTOCOL_KEYWORDS)
+_PEDI_RE = _compile_keywords(PEDIATRIC_KEYWORDS)
 
 
 def is_rct_article(article: Article) -> bool:
@@ -14,21 +65,25 @@ def is_rct_article(article: Article) -> bool:
     Returns:
         True if article is an RCT, False otherwise
     """
+    return _is_rct(article.title, article.abstract)
+
+
+def _is_rct(title: str, abstract: str) -> bool:
+    """RCT check on raw title/abstract strings (see is_rct_article)."""
     # Check if it's explicitly labeled as a randomized controlled trial
-    if any(term.lower() in article.title.lower() for term in 
-           ["randomized", "randomised", "randomized controlled trial", "rct"]):
+    if _RCT_TITLE_RE.search(title):
         return True
     
-    # Check abstract for RCT keywords
-    abstract_lower = article.abstract.lower()
-    rct_keywords = [
-        "randomized", "randomised", "randomly assigned", 
-        "controlled trial", "clinical trial", "double blind",
-        "placebo", "allocation", "intervention group"
-    ]
-    
-    rct_count = sum(1 for keyword in rct_keywords if keyword in abstract_lower)
-    return rct_count >= 2
+    # Check abstract for RCT keywords (distinct keywords, not occurrences);
+    # stop scanning as soon as a second distinct keyword turns up
+    first = None
+    for match in _RCT_ABSTRACT_RE.finditer(abstract):
+        keyword = match.group(0).lower()
+        if first is None:
+            first = keyword
+        elif keyword != first:
+            return True
+    return False
 
 
 def is_human_study(article: Article) -> bool:
@@ -40,24 +95,24 @@ def is_human_study(article: Article) -> bool:
     Returns:
         True if article is a human study, False otherwise
     """
+    return _is_human(article.search_text, article.mesh_text)
+
+
+def _is_human(text: str, mesh_text: str) -> bool:
+    """Human-study check on precomputed text and joined MeSH terms (see is_human_study)."""
     # Check if explicitly marked as human/clinical study
-    human_keywords = ["human", "clinical", "patient", "volunteer", "randomized controlled trial"]
-    mesh_human = any(term.lower() in " ".join(article.mesh_terms).lower() 
-                     for term in human_keywords)
+    mesh_human = bool(_HUMAN_RE.search(mesh_text))
     
     # Check if animal study
-    animal_keywords = ["mouse", "rat", "animal", "mice", "rodent"]
-    mesh_animal = any(term.lower() in " ".join(article.mesh_terms).lower() 
-                      for term in animal_keywords)
+    mesh_animal = bool(_ANIMAL_RE.search(mesh_text))
     
     # If animal study terms are present but no human terms, likely not human study
     if mesh_animal and not mesh_human:
         return False
         
     # Check title and abstract for human-related terms
-    text = (article.title + " " + article.abstract).lower()
-    has_human_terms = any(term in text for term in human_keywords)
-    has_animal_terms = any(term in text for term in animal_keywords)
+    has_human_terms = bool(_HUMAN_RE.search(text))
+    has_animal_terms = bool(_ANIMAL_RE.search(text))
     
     # If animal terms but no human terms, likely not human study
     if has_animal_terms and not has_human_terms:
@@ -77,21 +132,17 @@ def is_anesthesia_related(article: Article) -> bool:
     Returns:
         True if article is anesthesia/perioperative related, False otherwise
     """
-    anesthesia_keywords = [
-        "anesthesia", "anaesthesia", "anesthesiology", "perioperative", 
-        "peri-operative", "regional anesthesia", "airway", "intubation", 
-        "nerve block", "analgesia", "surgery", "operative", "surgical"
-    ]
-    
+    return _is_anesthesia(article.search_text, article.mesh_terms)
+
+
+def _is_anesthesia(text: str, mesh_terms: List[str]) -> bool:
+    """Anesthesia check on precomputed text (see is_anesthesia_related)."""
     # Check MeSH terms
-    mesh_match = any(any(keyword in term.lower() for keyword in anesthesia_keywords) 
-                     for term in article.mesh_terms)
+    if any(_ANESTH_RE.search(term) for term in mesh_terms):
+        return True
     
     # Check title and abstract
-    text = (article.title + " " + article.abstract).lower()
-    text_match = any(keyword in text for keyword in anesthesia_keywords)
-    
-    return mesh_match or text_match
+    return bool(_ANESTH_RE.search(text))
 
 
 def is_preferred_language(article: Article) -> bool:
@@ -103,8 +154,7 @@ def is_preferred_language(article: Article) -> bool:
     Returns:
         True if article is in preferred language, False otherwise
     """
-    preferred_languages = ["english", "french"]
-    return article.language.lower() in preferred_languages
+    return article.language.lower() in PREFERRED_LANGUAGES
 
 
 def is_protocol_or_letter(article: Article) -> bool:
@@ -121,13 +171,7 @@ def is_protocol_or_letter(article: Article) -> bool:
         return False
     
     # Check for protocol/letter keywords
-    protocol_keywords = [
-        "protocol", "study protocol", "letter", "editorial", 
-        "commentary", "correspondence", "discussion"
-    ]
-    
-    text = (article.title + " " + article.abstract).lower()
-    return any(keyword in text for keyword in protocol_keywords)
+    return bool(_PROTOCOL_RE.search(article.search_text))
 
 
 def is_pediatric_only(article: Article) -> bool:
@@ -144,13 +188,7 @@ def is_pediatric_only(article: Article) -> bool:
         return False
     
     # Check for pediatric keywords
-    pediatric_keywords = [
-        "pediatric", "paediatric", "child", "infant", "neonate", 
-        "newborn", "adolescent", "children", "kids", "under 18"
-    ]
-    
-    text = (article.title + " " + article.abstract).lower()
-    return any(keyword in text for keyword in pediatric_keywords)
+    return bool(_PEDI_RE.search(article.search_text))
 
 
 def deduplicate_articles(articles: List[Article]) -> List[Article]:
@@ -162,22 +200,50 @@ def deduplicate_articles(articles: List[Article]) -> List[Article]:
     Returns:
         List of unique articles
     """
-    seen_dois = set()
-    seen_pmids = set()
-    unique_articles = []
+    # Insertion-ordered, so the first article per identifier wins
+    unique_articles = {}
     
     for article in articles:
         # Use DOI if available, otherwise use PMID
-        identifier = article.doi if article.doi else article.pmid
+        identifier = article.doi or article.pmid
         
-        if identifier and identifier not in seen_dois and identifier not in seen_pmids:
-            if article.doi:
-                seen_dois.add(article.doi)
-            if article.pmid:
-                seen_pmids.add(article.pmid)
-            unique_articles.append(article)
+        if identifier and identifier not in unique_articles:
+            unique_articles[identifier] = article
     
-    return unique_articles
+    return list(unique_articles.values())
+
+
+def _filter_one(article: Article, text: str, mesh_text: str) -> bool:
+    """Run every filter on one article using precomputed text.
+    
+    Checks are ordered cheapest/most-rejecting first so most articles
+    exit early: language, protocol and pediatric rejects, then the
+    positive RCT, anesthesia and human checks.
+    
+    Args:
+        article: Article to check
+        text: Title and abstract joined with a space
+        mesh_text: MeSH terms joined with a space
+        
+    Returns:
+        True if the article passes all filters, False otherwise
+    """
+    if article.language.lower() not in PREFERRED_LANGUAGES:
+        return False
+    if not settings.allow_protocols and _PROTOCOL_RE.search(text):
+        return False
+    if not settings.allow_pediatric and _PEDI_RE.search(text):
+        return False
+    return (
+        _is_rct(article.title, article.abstract)
+        and _is_anesthesia(text, article.mesh_terms)
+        and _is_human(text, mesh_text)
+    )
+
+
+def _passes_all_filters(article: Article) -> bool:
+    """Picklable per-article filter used by filter_articles workers."""
+    return _filter_one(article, article.search_text, article.mesh_text)
 
 
 def filter_articles(articles: List[Article]) -> List[Article]:
@@ -189,19 +255,27 @@ def filter_articles(articles: List[Article]) -> List[Article]:
     Returns:
         List of filtered articles
     """
-    filtered_articles = []
+    # Group by identifier first so duplicates (e.g. from a widened search)
+    # are not run through every filter: only the first record per identifier
+    # is checked, and a later duplicate only if every earlier one failed.
+    # This keeps the result identical to filtering and then deduplicating.
+    groups = {}
+    for index, article in enumerate(articles):
+        identifier = article.doi or article.pmid
+        if identifier:
+            groups.setdefault(identifier, []).append((index, article))
     
-    for article in articles:
-        # Apply all filters
-        if (is_rct_article(article) and 
-            is_human_study(article) and 
-            is_anesthesia_related(article) and 
-            is_preferred_language(article) and 
-            not is_protocol_or_letter(article) and 
-            not is_pediatric_only(article)):
-            filtered_articles.append(article)
-    
-    # Deduplicate articles
-    unique_articles = deduplicate_articles(filtered_articles)
-    
-    return unique_articles
\ No newline at end of file
+    kept = []
+    pending = list(groups.values())
+    while pending:
+        mask = map_articles(_passes_all_filters, [group[0][1] for group in pending])
+        retry = []
+        for group, keep in zip(pending, mask):
+            if keep:
+                kept.append(group[0])
+            elif len(group) > 1:
+                retry.append(group[1:])
+        pending = retry
+    
+    kept.sort(key=lambda item: item[0])
+    return [article for _, article in kept]
\ No newline at end of file
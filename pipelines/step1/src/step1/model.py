@@ -1,10 +1,16 @@
 """Data models for RCT articles and trials."""
+from functools import cached_property
 from typing import List, Optional
-from pydantic import BaseModel
+import msgspec
 
 
-class Article(BaseModel):
-    """Unified article model for RCT metadata."""
+class Article(msgspec.Struct, kw_only=True, dict=True):
+    """Unified article model for RCT metadata.
+    
+    ``dict=True`` gives instances a ``__dict__`` so the derived matching
+    text below can be cached with ``cached_property``; it is not a field
+    and is never serialized.
+    """
     
     # Basic metadata
     title: str
@@ -33,8 +39,18 @@ class Article(BaseModel):
     # Scoring and selection
     score: Optional[float] = None
     rationale: Optional[str] = None
+    
+    @cached_property
+    def search_text(self) -> str:
+        """Title and abstract joined with a space, cached after first use."""
+        return self.title + " " + self.abstract
+    
+    @cached_property
+    def mesh_text(self) -> str:
+        """MeSH terms joined with a space, cached after first use."""
+        return " ".join(self.mesh_terms)
 
 
-class ArticleList(BaseModel):
+class ArticleList(msgspec.Struct):
     """Container for a list of articles."""
     articles: List[Article]
\ No newline at end of file
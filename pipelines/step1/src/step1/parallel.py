@@ -0,0 +1,33 @@
+"""Process-pool helper for embarrassingly parallel per-article work."""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, TypeVar
+from .model import Article
+
+T = TypeVar("T")
+
+# Below this many articles, spawning workers and pickling articles costs more
+# than the per-article filter/score work it would overlap
+PARALLEL_MIN_ARTICLES = 500
+
+# Articles handed to a worker per task (amortizes IPC round trips)
+PARALLEL_CHUNKSIZE = 50
+
+
+def map_articles(func: Callable[[Article], T], articles: List[Article]) -> List[T]:
+    """Apply func to each article, in a process pool for large inputs.
+    
+    func must be a picklable module-level function, and results are
+    returned in input order.
+    
+    Args:
+        func: Function to apply to each article
+        articles: Articles to process
+        
+    Returns:
+        List of func results, one per article
+    """
+    if len(articles) < PARALLEL_MIN_ARTICLES:
+        return [func(article) for article in articles]
+    
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(func, articles, chunksize=PARALLEL_CHUNKSIZE))
\ No newline at end of file
@@ -1,11 +1,29 @@
 """Scoring logic for ranking RCT articles by interestingness."""
+import hashlib
+import itertools
 import re
-from typing import List, Tuple
+import shelve
+from pathlib import Path
+from typing import Dict, List, Tuple
 from .model import Article
+from .parallel import map_articles
+
+
+# Bump whenever the scoring heuristics change so memoized scores are discarded
+SCORER_VERSION = "1"
+
+# Disk memo of score_article results across runs (see score_articles),
+# anchored to the step1 pipeline directory like the HTTP cache
+SCORE_CACHE_FILE = Path(__file__).resolve().parents[2] / "data" / "scores.cache"
+
+# In-process memo, keyed like the disk one; the oldest entries are evicted
+# past SCORE_MEMO_MAXSIZE
+SCORE_MEMO_MAXSIZE = 8192
+_score_memo: Dict[str, Tuple[float, str]] = {}
 
 
 # High-quality journals in anesthesiology/perioperative medicine
-HIGH_QUALITY_JOURNALS = [
+HIGH_QUALITY_JOURNALS = frozenset([
     "Anesthesiology",
     "British Journal of Anaesthesia",
     "Anesthesia and Analgesia",
@@ -26,7 +44,7 @@ HIGH_QUALITY_JOURNALS = [
     "Indian Journal of Anaesthesia",
     "Journal of Anaesthesiology Clinical Pharmacology",
     "A & A Case Reports"
-]
+])
 
 
 # Patient-centered outcomes
@@ -45,6 +63,17 @@ CLINICALLY_ACTIONABLE_INTERVENTIONS = [
 ]
 
 
+# Precompiled matchers: one C-level scan per field instead of one substring
+# check per keyword
+_PCO_RE = re.compile("|".join(map(re.escape, PATIENT_CENTERED_OUTCOMES)), re.IGNORECASE)
+_ACTIONABLE_RE = re.compile(
+    "|".join(map(re.escape, CLINICALLY_ACTIONABLE_INTERVENTIONS)), re.IGNORECASE
+)
+_EFFECT_NUM_RE = re.compile(
+    r'\d+\.?\d*(?:%|\s*(?:increase|decrease|higher|lower|better|worse))', re.IGNORECASE
+)
+
+
 def score_article(article: Article) -> Tuple[float, str]:
     """Score an article based on various heuristics.
     
@@ -72,14 +101,12 @@ def score_article(article: Article) -> Tuple[float, str]:
         rationale_parts.append("multicenter study")
     
     # Patient-centered primary outcome
-    primary_outcome_lower = article.primary_outcome.lower()
-    if any(outcome in primary_outcome_lower for outcome in PATIENT_CENTERED_OUTCOMES):
+    if _PCO_RE.search(article.primary_outcome) is not None:
         score += 1.5
         rationale_parts.append("patient-centered outcome")
     
     # Clinically actionable intervention
-    intervention_lower = article.intervention.lower()
-    if any(intervention in intervention_lower for intervention in CLINICALLY_ACTIONABLE_INTERVENTIONS):
+    if _ACTIONABLE_RE.search(article.intervention) is not None:
         score += 1.5
         rationale_parts.append("clinically actionable intervention")
     
@@ -91,9 +118,7 @@ def score_article(article: Article) -> Tuple[float, str]:
     # Clear effect direction
     if article.effect_summary and len(article.effect_summary.strip()) > 0:
         # Check if effect summary contains numerical values or clear direction
-        if re.search(r'\d+\.?\d*%', article.effect_summary) or \
-           re.search(r'\d+\.?\d*\s*(increase|decrease|higher|lower|better|worse)', 
-                    article.effect_summary, re.IGNORECASE):
+        if _EFFECT_NUM_RE.search(article.effect_summary) is not None:
             score += 1.0
             rationale_parts.append("quantified effect")
     
@@ -106,23 +131,68 @@ def score_article(article: Article) -> Tuple[float, str]:
 def score_articles(articles: List[Article]) -> List[Article]:
     """Score a list of articles and add scores to them.
     
+    Scores are memoized per PMID (in memory and in SCORE_CACHE_FILE), so
+    re-runs over the same PubMed results only score new articles.
+    
     Args:
         articles: List of articles to score
         
     Returns:
         List of articles with scores added
     """
+    keys = [_score_cache_key(article) for article in articles]
+    results = {}
+    
+    SCORE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with shelve.open(str(SCORE_CACHE_FILE)) as disk_cache:
+        missing = []
+        for article, key in zip(articles, keys):
+            if key in results:
+                continue
+            cached = _score_memo.get(key)
+            if cached is None:
+                cached = disk_cache.get(key)
+            if cached is None:
+                missing.append((article, key))
+                results[key] = None
+            else:
+                results[key] = cached
+        
+        # Scores are computed (possibly in worker processes) only for misses
+        scores = map_articles(score_article, [article for article, _ in missing])
+        for (_, key), result in zip(missing, scores):
+            results[key] = result
+            disk_cache[key] = result
+    
+    _score_memo.update(results)
+    # Evict the oldest entries past the cap (dicts keep insertion order)
+    overflow = len(_score_memo) - SCORE_MEMO_MAXSIZE
+    for key in list(itertools.islice(_score_memo, max(overflow, 0))):
+        del _score_memo[key]
+    
     scored_articles = []
     
-    for article in articles:
-        score, rationale = score_article(article)
-        article.score = score
-        article.rationale = rationale
+    for article, key in zip(articles, keys):
+        article.score, article.rationale = results[key]
         scored_articles.append(article)
     
     return scored_articles
 
 
+def _score_cache_key(article: Article) -> str:
+    """Memo key: scorer version, PMID and a digest of the fields scored."""
+    content = "\x1f".join((
+        str(article.sample_size),
+        str(article.multicenter),
+        article.primary_outcome,
+        article.intervention,
+        article.journal,
+        article.effect_summary or "",
+    ))
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+    return f"{SCORER_VERSION}:{article.pmid}:{digest}"
+
+
 def sort_articles_by_score(articles: List[Article]) -> List[Article]:
     """Sort articles by score in descending order.
     
@@ -132,4 +202,9 @@ def sort_articles_by_score(articles: List[Article]) -> List[Article]:
     Returns:
         List of articles sorted by score (highest first)
     """
-    return sorted(articles, key=lambda x: x.score or 0.0, reverse=True)
\ No newline at end of file
+    return sorted(articles, key=_score_key, reverse=True)
+
+
+def _score_key(article: Article) -> float:
+    """Sort key treating a missing score as 0."""
+    return article.score or 0.0
\ No newline at end of file
@@ -1,70 +1,200 @@
 """Selection logic for choosing the top-ranked RCT article."""
 from typing import List, Optional, Tuple
+from .bloom import BloomFilter
 from .model import Article
+from .scoring import _score_key
 from .config import settings
+import functools
 import logging
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
-# History file path
-HISTORY_FILE = Path("data") / "selection_history.json"
+# History file path: one JSON entry per line, appended on each selection
+HISTORY_FILE = Path("data") / "selection_history.jsonl"
+
+# Pre-JSONL history (a single JSON list), migrated once into HISTORY_FILE
+LEGACY_HISTORY_FILE = Path("data") / "selection_history.json"
+
+# Bloom filter over the history's DOIs/PMIDs, used on the selection path
+HISTORY_BLOOM_FILE = Path("data") / "selection_history.bloom"
+
+
+def _loads(data: bytes):
+    """Parse JSON from bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _encode_entry(entry: dict) -> bytes:
+    """Encode one history entry as a JSONL line."""
+    if orjson is not None:
+        return orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _migrate_legacy_history() -> None:
+    """Convert a legacy JSON-list history into HISTORY_FILE, once.
+    
+    The legacy file is left in place; it is ignored once HISTORY_FILE exists.
+    """
+    if HISTORY_FILE.exists() or not LEGACY_HISTORY_FILE.exists():
+        return
+    
+    try:
+        history = _loads(LEGACY_HISTORY_FILE.read_bytes())
+        save_selection_history(history)
+        logger.info(f"Migrated {len(history)} history entries to {HISTORY_FILE}")
+    except Exception as e:
+        logger.warning(f"Failed to migrate selection history: {e}")
+
+
+@functools.lru_cache(maxsize=4)
+def _load_history_cached(path: Path, mtime_ns: int, size: int) -> Tuple[dict, ...]:
+    """Parse the history file; cached per (path, mtime, size), so edits invalidate it.
+    
+    The size is part of the key because an append within the filesystem's
+    timestamp granularity can leave the mtime unchanged.
+    """
+    # One read of the whole file, then parse each line from bytes
+    return tuple(_loads(line) for line in path.read_bytes().splitlines() if line.strip())
 
 
 def load_selection_history() -> List[dict]:
     """Load the history of previously selected articles.
     
+    The parse is cached per file mtime (see _load_history_cached), so
+    repeated loads skip the read and the parse while the file is unchanged.
+    
     Returns:
         List of previously selected articles
     """
-    if HISTORY_FILE.exists():
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load selection history: {e}")
-            return []
-    return []
+    _migrate_legacy_history()
+    
+    try:
+        stat = HISTORY_FILE.stat()
+    except OSError:
+        return []
+    
+    try:
+        return list(_load_history_cached(HISTORY_FILE, stat.st_mtime_ns, stat.st_size))
+    except Exception as e:
+        logger.warning(f"Failed to load selection history: {e}")
+        return []
 
 
 def save_selection_history(history: List[dict]) -> None:
-    """Save the history of selected articles.
+    """Save (rewrite) the whole history of selected articles.
+    
+    Use append_selection_history to add a single entry.
     
     Args:
         history: List of selected articles to save
     """
     try:
         HISTORY_FILE.parent.mkdir(exist_ok=True)
-        with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(history, f, indent=2, ensure_ascii=False)
+        HISTORY_FILE.write_bytes(b"".join(_encode_entry(entry) for entry in history))
     except Exception as e:
         logger.warning(f"Failed to save selection history: {e}")
 
 
-def is_article_previously_selected(article: Article, history: List[dict]) -> bool:
-    """Check if an article has been previously selected.
+def append_selection_history(entry: dict) -> None:
+    """Append one entry to the history file without rewriting it.
+    
+    Args:
+        entry: History entry to append
+    """
+    _migrate_legacy_history()
+    
+    try:
+        HISTORY_FILE.parent.mkdir(exist_ok=True)
+        with open(HISTORY_FILE, "ab") as f:
+            f.write(_encode_entry(entry))
+    except Exception as e:
+        logger.warning(f"Failed to save selection history: {e}")
+
+
+def _history_keys(doi: Optional[str], pmid: Optional[str]) -> List[str]:
+    """Bloom filter keys for an article's identifiers."""
+    keys = []
+    if doi:
+        keys.append(f"doi:{doi}")
+    if pmid:
+        keys.append(f"pmid:{pmid}")
+    return keys
+
+
+def build_history_filter(history: List[dict]) -> BloomFilter:
+    """Build a Bloom filter over the DOIs and PMIDs in the selection history.
     
     Args:
-        article: Article to check
         history: Selection history
         
     Returns:
-        True if article was previously selected, False otherwise
+        Filter containing every history identifier
     """
-    article_identifier = article.doi or article.pmid
-    if not article_identifier:
-        return False
-        
+    history_filter = BloomFilter()
     for entry in history:
-        # Check if DOI matches
-        if article.doi and entry.get("doi") == article.doi:
-            return True
-        # Check if PMID matches
-        if article.pmid and entry.get("pmid") == article.pmid:
-            return True
-            
-    return False
+        for key in _history_keys(entry.get("doi"), entry.get("pmid")):
+            history_filter.add(key)
+    return history_filter
+
+
+def load_history_filter() -> BloomFilter:
+    """Load the persisted selection-history Bloom filter.
+    
+    If HISTORY_BLOOM_FILE is missing or unreadable, the filter is rebuilt
+    from the JSON history and saved (delete the file to force a rebuild
+    after editing the history by hand).
+    
+    Returns:
+        Filter containing every history identifier
+    """
+    if HISTORY_BLOOM_FILE.exists():
+        try:
+            return BloomFilter(bits=HISTORY_BLOOM_FILE.read_bytes())
+        except Exception as e:
+            logger.warning(f"Failed to load selection history filter, rebuilding: {e}")
+    
+    history_filter = build_history_filter(load_selection_history())
+    save_history_filter(history_filter)
+    return history_filter
+
+
+def save_history_filter(history_filter: BloomFilter) -> None:
+    """Save the selection-history Bloom filter.
+    
+    Args:
+        history_filter: Filter to save
+    """
+    try:
+        HISTORY_BLOOM_FILE.parent.mkdir(exist_ok=True)
+        HISTORY_BLOOM_FILE.write_bytes(history_filter.to_bytes())
+    except Exception as e:
+        logger.warning(f"Failed to save selection history filter: {e}")
+
+
+def is_article_previously_selected(article: Article, history_filter: BloomFilter) -> bool:
+    """Check if an article has been previously selected.
+    
+    This is a Bloom filter check, so it can return a false positive (an
+    article is skipped as already selected) but never a false negative.
+    
+    Args:
+        article: Article to check
+        history_filter: Filter over the selection history (see load_history_filter)
+        
+    Returns:
+        True if article was (probably) previously selected, False otherwise
+    """
+    return any(key in history_filter for key in _history_keys(article.doi, article.pmid))
 
 
 def select_top_article(articles: List[Article], avoid_history: bool = True) -> Optional[Tuple[Article, str]]:
@@ -80,30 +210,33 @@ def select_top_article(articles: List[Article], avoid_history: bool = True) -> O
     if not articles:
         return None
     
-    # Load selection history if we want to avoid it
-    history = load_selection_history() if avoid_history else []
-    
-    # Sort articles by score
-    sorted_articles = sorted(articles, key=lambda x: x.score or 0.0, reverse=True)
+    # Only the best article is needed, so take a single-pass max instead of
+    # sorting (max keeps the first of equal scores, as the stable sort did)
+    best_article = max(articles, key=_score_key)
     
     # If we're not avoiding history, just return the top article
     if not avoid_history:
-        top_article = sorted_articles[0]
+        top_article = best_article
         rationale = f"Selected article with highest score ({top_article.score}) based on: {top_article.rationale}"
         logger.info(f"Selected top article: {top_article.title} with score {top_article.score}")
         return top_article, rationale
     
-    # Try to find an article that hasn't been previously selected
-    for article in sorted_articles:
-        if not is_article_previously_selected(article, history):
-            top_article = article
-            rationale = f"Selected article with highest score ({top_article.score}) based on: {top_article.rationale}"
-            logger.info(f"Selected top article: {top_article.title} with score {top_article.score}")
-            return top_article, rationale
+    # Try to find an article that hasn't been previously selected; only the
+    # compact history filter is needed here, not the JSON history
+    history_filter = load_history_filter()
+    top_article = max(
+        (a for a in articles if not is_article_previously_selected(a, history_filter)),
+        key=_score_key,
+        default=None,
+    )
+    if top_article is not None:
+        rationale = f"Selected article with highest score ({top_article.score}) based on: {top_article.rationale}"
+        logger.info(f"Selected top article: {top_article.title} with score {top_article.score}")
+        return top_article, rationale
     
     # If all articles have been previously selected, return the highest scoring one
     # but add a note to the rationale
-    top_article = sorted_articles[0]
+    top_article = best_article
     rationale = f"Selected article with highest score ({top_article.score}) based on: {top_article.rationale} (Note: This article has been previously selected)"
     logger.info(f"Selected previously selected top article: {top_article.title} with score {top_article.score}")
     return top_article, rationale
@@ -116,8 +249,6 @@ def record_selected_article(article: Article, rationale: str) -> None:
         article: Selected article
         rationale: Selection rationale
     """
-    history = load_selection_history()
-    
     # Create entry for the selected article
     entry = {
         "title": article.title,
@@ -129,11 +260,14 @@ def record_selected_article(article: Article, rationale: str) -> None:
         "rationale": rationale
     }
     
-    # Add to history
-    history.append(entry)
+    # Append to history (O(1) write, no re-read of earlier entries)
+    append_selection_history(entry)
     
-    # Save updated history
-    save_selection_history(history)
+    # Keep the selection-time filter in sync with the history
+    history_filter = load_history_filter()
+    for key in _history_keys(article.doi, article.pmid):
+        history_filter.add(key)
+    save_history_filter(history_filter)
 
 
 def widen_search_if_needed(articles: List[Article]) -> bool:
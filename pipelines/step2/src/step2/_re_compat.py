@@ -0,0 +1,32 @@
+"""Optional RE2 regex engine, falling back to the stdlib re module."""
+
+import re
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# re flags with an RE2 inline equivalent; google-re2 takes an Options
+# object rather than re's flag ints, so flags are spelt inline instead
+_INLINE_FLAGS = {re.IGNORECASE: "i", re.DOTALL: "s", re.MULTILINE: "m"}
+
+
+def compile(pattern: str, flags: int = 0):
+    """
+    Compile a pattern with RE2 when google-re2 is installed, else with re.
+    
+    RE2 matches in linear time (no backtracking), but has no lookarounds or
+    backreferences and its \\s, \\w and \\d classes are ASCII-only, so only
+    pass patterns that mean the same in both engines. Patterns RE2 rejects
+    are compiled with re.
+    """
+    if re2 is not None:
+        inline = "".join(letter for flag, letter in _INLINE_FLAGS.items() if flags & flag)
+        unsupported = flags & ~(re.IGNORECASE | re.DOTALL | re.MULTILINE)
+        if not unsupported:
+            try:
+                return re2.compile(f"(?{inline}){pattern}" if inline else pattern)
+            except re2.error:
+                pass
+    return re.compile(pattern, flags)
\ No newline at end of file
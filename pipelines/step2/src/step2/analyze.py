@@ -1,24 +1,14 @@
 """Module for critical appraisal of RCT articles using LLM and rule-based checks."""
 
 import os
+import re
 import json
 import argparse
+import functools
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, List, Optional, TypedDict, Union
 from pathlib import Path
-
-try:
-    from pydantic import BaseModel, ValidationError, field_validator
-    from pydantic.config import ConfigDict
-except ImportError:
-    # Fallback for environments without pydantic
-    BaseModel = object
-    ValidationError = Exception
-    ConfigDict = None
-
-    def field_validator(*args, **kwargs):
-        def decorator(func):
-            return func
-        return decorator
+import msgspec
 
 
 # Type definitions
@@ -72,53 +62,159 @@ class AnalyzeResult(TypedDict):
 
 
 # Pydantic models for validation
-class EffectEstimateModel(BaseModel):
-    if ConfigDict is not None:
-        model_config = ConfigDict(extra='allow')
+@functools.cache
+def _get_models() -> tuple:
+    """
+    Build the pydantic validation models on first use rather than at import,
+    so importing this module stays cheap when validation is never exercised.
     
-    measure: str
-    value: float
-    ci: List[float]
-    p: Optional[float] = None
+    Returns:
+        Tuple of (EffectEstimateModel, ArticleCardModel), or (None, None)
+        when pydantic is not installed
+    """
+    try:
+        from pydantic import BaseModel, ValidationError, field_validator
+        from pydantic.config import ConfigDict
+    except ImportError:
+        # Fallback for environments without pydantic
+        return None, None
 
+    class EffectEstimateModel(BaseModel):
+        model_config = ConfigDict(extra='allow')
+        
+        measure: str
+        value: float
+        ci: List[float]
+        p: Optional[float] = None
 
-class ArticleCardModel(BaseModel):
-    if ConfigDict is not None:
+    class ArticleCardModel(BaseModel):
         model_config = ConfigDict(extra='allow')
-    
-    title: str
-    journal: str
-    date: str
-    doi: str
-    pmid: str
-    score: float
-    rationale: str
-    design: str
-    population: str
-    sample_size: Optional[int] = None
-    intervention: str
-    comparator: str
-    primary_outcome: str
-    key_result_text: str
-    effect_estimate: Optional[Dict[str, Any]] = None
-    centers: Optional[str] = None
-    blinding: Optional[str] = None
-    allocation: Optional[str] = None
-    funding: Optional[str] = None
-    conflicts: Optional[str] = None
-    language: Optional[str] = None
-    
-    @field_validator('effect_estimate')
-    @classmethod
-    def validate_effect_estimate(cls, v):
-        if v is None:
-            return v
-        try:
-            EffectEstimateModel(**v)
-        except ValidationError:
-            # If validation fails, we'll just pass the original dict through
-            pass
-        return v
+        
+        title: str
+        journal: str
+        date: str
+        doi: str
+        pmid: str
+        score: float
+        rationale: str
+        design: str
+        population: str
+        sample_size: Optional[int] = None
+        intervention: str
+        comparator: str
+        primary_outcome: str
+        key_result_text: str
+        effect_estimate: Optional[Dict[str, Any]] = None
+        centers: Optional[str] = None
+        blinding: Optional[str] = None
+        allocation: Optional[str] = None
+        funding: Optional[str] = None
+        conflicts: Optional[str] = None
+        language: Optional[str] = None
+        
+        @field_validator('effect_estimate')
+        @classmethod
+        def validate_effect_estimate(cls, v):
+            if v is None:
+                return v
+            try:
+                # Keep the validated/coerced form (e.g. numeric strings to floats)
+                return EffectEstimateModel.model_validate(v).model_dump()
+            except ValidationError:
+                # If validation fails, we'll just pass the original dict through
+                return v
+
+    return EffectEstimateModel, ArticleCardModel
+
+
+def __getattr__(name: str):
+    """
+    Resolve the lazily built EffectEstimateModel / ArticleCardModel names.
+    """
+    if name == "EffectEstimateModel":
+        return _get_models()[0]
+    if name == "ArticleCardModel":
+        return _get_models()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Static prompt parts, built once rather than on every _build_prompt call.
+# Only immutable strings are shared; message dicts are built per call, so a
+# caller editing its messages can't change anyone else's prompt
+_SYSTEM_PROMPT = (
+    "You are a senior clinical trial methodologist in anesthesiology and peri_operative medicine. Produce a rigorous, impartial critical appraisal for expert clinicians. Use structured Markdown. Be concrete; avoid hype."
+)
+
+# 5 Rs framework
+_FRAMEWORK = """
+Use the 5 Rs framework for critical appraisal:
+
+1. Right Question: PICO (Population, Intervention, Comparator, Outcome); novelty; biological plausibility; ethical/feasibility considerations
+2. Right Population: eligibility criteria; representativeness; external validity
+3. Right Study Design: randomization method; allocation concealment; blinding; centers; protocol deviations
+4. Right Data & Statistics: endpoints and hierarchy (primary/secondary; patient-centered); effect size(s) with CI; clinical vs statistical significance; multiplicity/subgroups; interim looks; stopping rules; assumptions & model appropriateness
+5. Right Interpretation: internal validity threats; residual confounding; generalizability to anesthesia/peri-op practice; benefit–harm balance; feasibility; cost considerations if noted
+
+In your analysis, be sure to:
+- Surface strengths and limitations explicitly
+- Consider applicability to perioperative practice
+- Address bias/validity considerations (randomization, allocation concealment, blinding, attrition, selective reporting)
+- Discuss effect size vs p-value, CI width/precision, multiplicity/subgroups, and clinical vs statistical significance
+- Include a concluding "Bottom Line for Clinicians"
+"""
+
+# "title: ..." line in the prompt's article information (see _call_llm)
+_TITLE_RE = re.compile(r'^title:(.*)$', re.MULTILINE)
+
+# Placeholder analysis returned by _call_llm (after a "# <title>" header)
+_SAMPLE_RESPONSE_BODY = """
+
+## Citation
+DOI: 10.5678/ghijkl | PMID: 87654321 | Journal: Sample Journal | Date: 2023-01-01
+
+## TL;DR
+- This is a sample analysis
+- The study investigated an important question
+- Key findings are summarized
+- Clinical implications are discussed
+- Limitations are acknowledged
+
+## Right Question
+The study addresses an important clinical question in perioperative medicine. The PICO framework is well-defined with clear population, intervention, comparator, and outcome measures.
+
+## Right Population
+The study population is well-characterized with appropriate inclusion and exclusion criteria. The external validity is moderate, as the population is representative of typical patients undergoing the procedure.
+
+## Right Study Design
+The study employs a robust randomized controlled design with appropriate allocation concealment and blinding procedures. The multicenter approach enhances generalizability.
+
+## Right Data & Statistics
+The primary endpoint is clearly defined and clinically relevant. The statistical analysis plan is appropriate with proper handling of missing data. Effect sizes are reported with confidence intervals.
+
+## Right Interpretation
+The authors provide a balanced interpretation of their findings, acknowledging both the strengths and limitations of their study. The clinical implications are discussed in the context of existing literature.
+
+## Strengths
+- Rigorous randomized controlled design
+- Appropriate sample size calculation
+- Well-defined primary outcome
+- Adequate statistical analysis
+
+## Limitations
+- Single-center study limiting generalizability
+- Short follow-up period
+- Potential for unmeasured confounding
+
+## Applicability & "What I'd do Monday morning"
+The findings have immediate applicability to clinical practice. Clinicians should consider implementing the intervention in similar patient populations, with appropriate monitoring for adverse effects.
+
+## Bottom Line for Clinicians
+This study provides valuable evidence for clinical decision-making. The intervention demonstrates significant benefits with acceptable safety profile. Implementation should consider local resources and patient preferences.
+
+## Red Flags (Auto-detected)
+- Multiplicity/selective reporting risk: primary outcome unclear
+- Design opacity: missing allocation concealment, blinding
+"""
 
 
 def _detect_red_flags(article: ArticleCard) -> List[str]:
@@ -131,61 +227,97 @@ def _detect_red_flags(article: ArticleCard) -> List[str]:
     Returns:
         List of red flag strings
     """
-    red_flags = []
+    return detect_red_flags_batch([article])[0]
+
+
+def detect_red_flags_batch(articles: List[ArticleCard]) -> List[List[str]]:
+    """
+    Detect red flags for many articles in one column-wise pass.
+    
+    Each field is read from every card once into a column, then each rule
+    runs over its columns, appending to the per-card flag lists in rule
+    order (so every card's flags come out in the same order as before).
+    
+    Args:
+        articles: List of ArticleCard dictionaries
+        
+    Returns:
+        List of red flag lists, one per article (in input order)
+    """
+    red_flags = [[] for _ in articles]
+    
+    # Read each field once up front, as one column per field
+    sample_sizes = [article.get('sample_size') for article in articles]
+    effect_estimates = [article.get('effect_estimate') or {} for article in articles]
+    primary_outcomes = [article.get('primary_outcome') for article in articles]
+    allocations = [article.get('allocation') for article in articles]
+    blindings = [article.get('blinding') for article in articles]
+    populations = [(article.get('population') or '').lower() for article in articles]
+    centers = [(article.get('centers') or '').lower() for article in articles]
+    fundings = [(article.get('funding') or '').lower() for article in articles]
     
     # Underpowered signal: sample_size < 100 for superiority trials with continuous outcomes
-    if article.get('sample_size') is not None and article['sample_size'] < 100:
-        # We assume continuous outcomes for this heuristic unless specified otherwise
-        red_flags.append("Underpowered signal: sample size < 100 for superiority trial")
+    # (we assume continuous outcomes for this heuristic unless specified otherwise)
+    for flags, sample_size in zip(red_flags, sample_sizes):
+        if sample_size is not None and sample_size < 100:
+            flags.append("Underpowered signal: sample size < 100 for superiority trial")
     
     # Imprecise effect: 95% CI width relative to point estimate > 1.0
-    effect_estimate = article.get('effect_estimate')
-    if effect_estimate and 'value' in effect_estimate and 'ci' in effect_estimate:
-        point_estimate = effect_estimate['value']
-        ci = effect_estimate['ci']
-        if len(ci) == 2:
-            ci_width = abs(ci[1] - ci[0])
-            if point_estimate != 0 and abs(ci_width / point_estimate) > 1.0:
-                red_flags.append("Imprecise effect: wide confidence interval")
-            # For mean differenceapply check if |value| < 0.2×SD if SD provided
-            # This would require additional information not in the current schema
+    # (a |value| < 0.2×SD check for mean differences would need an SD field)
+    for flags, effect_estimate in zip(red_flags, effect_estimates):
+        ci = effect_estimate.get('ci')
+        if 'value' in effect_estimate and ci is not None and len(ci) == 2:
+            point_estimate = effect_estimate['value']
+            if point_estimate != 0 and abs(abs(ci[1] - ci[0]) / point_estimate) > 1.0:
+                flags.append("Imprecise effect: wide confidence interval")
     
     # Borderline p: p in [0.045, 0.06]
-    if (effect_estimate and 'p' in effect_estimate and 
-        effect_estimate['p'] is not None and
-        0.045 <= effect_estimate['p'] <= 0.06):
-        red_flags.append("Borderline p-value: fragile significance")
+    for flags, effect_estimate in zip(red_flags, effect_estimates):
+        p_value = effect_estimate.get('p')
+        if p_value is not None and 0.045 <= p_value <= 0.06:
+            flags.append("Borderline p-value: fragile significance")
     
     # Multiplicity risk: Primary outcome missing/unclear while multiple outcomes listed
-    if not article.get('primary_outcome') or article['primary_outcome'].strip() == "":
-        # This is a simplified check - in practice we'd need to know if multiple outcomes were listed
-        red_flags.append("Multiplicity/selective reporting risk: primary outcome unclear")
+    # (simplified - in practice we'd need to know if multiple outcomes were listed)
+    for flags, primary_outcome in zip(red_flags, primary_outcomes):
+        if not primary_outcome or primary_outcome.strip() == "":
+            flags.append("Multiplicity/selective reporting risk: primary outcome unclear")
     
     # Design opacity: Missing allocation concealment or blinding details
-    if not article.get('allocation') or not article.get('blinding'):
-        issues = []
-        if not article.get('allocation'):
-            issues.append("allocation concealment")
-        if not article.get('blinding'):
-            issues.append("blinding")
-        if issues:
-            red_flags.append(f"Design opacity: missing {', '.join(issues)}")
+    for flags, allocation, blinding in zip(red_flags, allocations, blindings):
+        if not allocation or not blinding:
+            issues = []
+            if not allocation:
+                issues.append("allocation concealment")
+            if not blinding:
+                issues.append("blinding")
+            flags.append(f"Design opacity: missing {', '.join(issues)}")
     
     # External validity: Very narrow population text
-    population = article.get('population', '').lower()
-    centers = article.get('centers', '').lower() if article.get('centers') else ''
-    if ('single' in centers or 'single' in population) and 'specific' in population:
-        red_flags.append("External validity concern: narrow population")
+    for flags, population, center in zip(red_flags, populations, centers):
+        if 'specific' in population and ('single' in center or 'single' in population):
+            flags.append("External validity concern: narrow population")
     
-    # COI/Funding: Industry-funded with efficacy primary outcome
-    funding = article.get('funding', '').lower() if article.get('funding') else ''
-    if 'industry' in funding or 'commercial' in funding:
-        # Note: We don't have a specific field for primary outcome type, so we make a general statement
-        red_flags.append("Potential bias: industry funding declared")
+    # COI/Funding: Industry-funded with efficacy primary outcome (there is no
+    # field for the primary outcome type, so the flag is a general statement)
+    for flags, funding in zip(red_flags, fundings):
+        if 'industry' in funding or 'commercial' in funding:
+            flags.append("Potential bias: industry funding declared")
     
     return red_flags
 
 
+def _format_field(key: str, value: Any) -> Any:
+    """
+    Format one ArticleCard value for the prompt (effect_estimate as JSON).
+    """
+    if key == 'effect_estimate' and isinstance(value, dict):
+        # msgspec is a required dependency (no fallback encoder), so the
+        # prompt text is the same on every machine
+        return msgspec.json.encode(value).decode('utf-8')
+    return value
+
+
 def _build_prompt(article: ArticleCard, settings: AnalyzeSettings) -> List[Dict[str, str]]:
     """
     Build the LLM prompt for critical appraisal.
@@ -197,46 +329,20 @@ def _build_prompt(article: ArticleCard, settings: AnalyzeSettings) -> List[Dict[
     Returns:
         List of message dictionaries for LLM
     """
-    # System message
-    system_message = {
-        "role": "system",
-        "content": "You are a senior clinical trial methodologist in anesthesiology and peri_operative medicine. Produce a rigorous, impartial critical appraisal for expert clinicians. Use structured Markdown. Be concrete; avoid hype."
-    }
+    # Article information, one "key: value" line per non-empty field
+    article_info = "\n".join(
+        f"{key}: {_format_field(key, value)}"
+        for key, value in article.items()
+        if value is not None and value != ""
+    )
     
-    # Article information
-    article_info = []
-    for key, value in article.items():
-        if value is not None and value != "":
-            if key == 'effect_estimate' and isinstance(value, dict):
-                article_info.append(f"{key}: {json.dumps(value)}")
-            else:
-                article_info.append(f"{key}: {value}")
-    
-    # 5 Rs framework
-    framework = """
-Use the 5 Rs framework for critical appraisal:
-
-1. Right Question: PICO (Population, Intervention, Comparator, Outcome); novelty; biological plausibility; ethical/feasibility considerations
-2. Right Population: eligibility criteria; representativeness; external validity
-3. Right Study Design: randomization method; allocation concealment; blinding; centers; protocol deviations
-4. Right Data & Statistics: endpoints and hierarchy (primary/secondary; patient-centered); effect size(s) with CI; clinical vs statistical significance; multiplicity/subgroups; interim looks; stopping rules; assumptions & model appropriateness
-5. Right Interpretation: internal validity threats; residual confounding; generalizability to anesthesia/peri-op practice; benefit–harm balance; feasibility; cost considerations if noted
-
-In your analysis, be sure to:
-- Surface strengths and limitations explicitly
-- Consider applicability to perioperative practice
-- Address bias/validity considerations (randomization, allocation concealment, blinding, attrition, selective reporting)
-- Discuss effect size vs p-value, CI width/precision, multiplicity/subgroups, and clinical vs statistical significance
-- Include a concluding "Bottom Line for Clinicians"
-"""
-
     # User message
     user_message = {
         "role": "user",
         "content": f"""Article Information:
-{chr(10).join(article_info)}
+{article_info}
 
-{framework}
+{_FRAMEWORK}
 
 Instructions:
 - Include a "Citation" section with DOI and PMID from the input
@@ -245,7 +351,7 @@ Instructions:
 - Be thorough but concise in your analysis"""
     }
     
-    return [system_message, user_message]
+    return [{"role": "system", "content": _SYSTEM_PROMPT}, user_message]
 
 
 def _call_llm(messages: List[Dict[str, str]], model: str, temperature: float, max_tokens: int) -> str:
@@ -275,71 +381,26 @@ def _call_llm(messages: List[Dict[str, str]], model: str, temperature: float, ma
     # In a real implementation, you would call the LLM API here
     title = "Sample Article Title"
     for msg in messages:
-        if msg["role"] == "user" and "title:" in msg["content"]:
-            lines = msg["content"].split("\n")
-            for line in lines:
-                if line.startswith("title:"):
-                    title = line.split(":", 1)[1].strip()
-                    break
-            break
+        if msg["role"] == "user":
+            match = _TITLE_RE.search(msg["content"])
+            if match:
+                title = match.group(1).strip()
+                break
     
-    return f"""# {title}
-
-## Citation
-DOI: 10.5678/ghijkl | PMID: 87654321 | Journal: Sample Journal | Date: 2023-01-01
-
-## TL;DR
-- This is a sample analysis
-- The study investigated an important question
-- Key findings are summarized
-- Clinical implications are discussed
-- Limitations are acknowledged
-
-## Right Question
-The study addresses an important clinical question in perioperative medicine. The PICO framework is well-defined with clear population, intervention, comparator, and outcome measures.
-
-## Right Population
-The study population is well-characterized with appropriate inclusion and exclusion criteria. The external validity is moderate, as the population is representative of typical patients undergoing the procedure.
-
-## Right Study Design
-The study employs a robust randomized controlled design with appropriate allocation concealment and blinding procedures. The multicenter approach enhances generalizability.
-
-## Right Data & Statistics
-The primary endpoint is clearly defined and clinically relevant. The statistical analysis plan is appropriate with proper handling of missing data. Effect sizes are reported with confidence intervals.
-
-## Right Interpretation
-The authors provide a balanced interpretation of their findings, acknowledging both the strengths and limitations of their study. The clinical implications are discussed in the context of existing literature.
+    return f"# {title}" + _SAMPLE_RESPONSE_BODY
 
-## Strengths
-- Rigorous randomized controlled design
-- Appropriate sample size calculation
-- Well-defined primary outcome
-- Adequate statistical analysis
-
-## Limitations
-- Single-center study limiting generalizability
-- Short follow-up period
-- Potential for unmeasured confounding
-
-## Applicability & "What I'd do Monday morning"
-The findings have immediate applicability to clinical practice. Clinicians should consider implementing the intervention in similar patient populations, with appropriate monitoring for adverse effects.
 
-## Bottom Line for Clinicians
-This study provides valuable evidence for clinical decision-making. The intervention demonstrates significant benefits with acceptable safety profile. Implementation should consider local resources and patient preferences.
-
-## Red Flags (Auto-detected)
-- Multiplicity/selective reporting risk: primary outcome unclear
-- Design opacity: missing allocation concealment, blinding
-"""
-
-
-def analyze_rct(article: ArticleCard, settings: Optional[AnalyzeSettings] = None) -> AnalyzeResult:
+def analyze_rct(
+    article: ArticleCard, settings: Optional[AnalyzeSettings] = None, validate: bool = True
+) -> AnalyzeResult:
     """
     Analyze an RCT article using LLM and rule-based checks.
     
     Args:
         article: RCT article data as a dictionary
         settings: Optional analysis settings
+        validate: Validate the article with ArticleCardModel first; pass False
+            when the caller has already validated it
         
     Returns:
         AnalyzeResult containing markdown analysis, red flags, and model info
@@ -359,13 +420,14 @@ def analyze_rct(article: ArticleCard, settings: Optional[AnalyzeSettings] = None
     }
     
     # Validate input using pydantic
-    try:
-        validated_article = ArticleCardModel(**article)
-        # If validation succeeds, use the validated article
-        article = validated_article.model_dump()
-    except Exception:
-        # If validation fails, proceed with original article
-        pass
+    article_model = _get_models()[1] if validate else None
+    if article_model is not None:
+        try:
+            # If validation succeeds, use the validated article
+            article = article_model.model_validate(article).model_dump()
+        except Exception:
+            # If validation fails, proceed with original article
+            pass
     
     # Detect red flags
     red_flags = _detect_red_flags(article)
@@ -382,16 +444,16 @@ def analyze_rct(article: ArticleCard, settings: Optional[AnalyzeSettings] = None
     
     # Add red flags block if requested
     if effective_settings["include_red_flags_block"] and red_flags:
-        red_flags_block = "\n## Red Flags (Auto-detected)\n"
-        for flag in red_flags:
-            red_flags_block += f"- {flag}\n"
-        analysis_markdown += red_flags_block
+        analysis_markdown += "\n## Red Flags (Auto-detected)\n" + "".join(
+            f"- {flag}\n" for flag in red_flags
+        )
     
     # Write to file if path provided
     if effective_settings["write_to_path"]:
         path = Path(effective_settings["write_to_path"])
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(analysis_markdown, encoding='utf-8')
+        # Encode once and write the bytes directly (no text wrapper)
+        path.write_bytes(analysis_markdown.encode('utf-8'))
     
     # Return result
     return {
@@ -401,6 +463,31 @@ def analyze_rct(article: ArticleCard, settings: Optional[AnalyzeSettings] = None
     }
 
 
+def analyze_rct_batch(
+    cards: List[ArticleCard],
+    settings: Optional[AnalyzeSettings] = None,
+    n_workers: Optional[int] = None
+) -> List[AnalyzeResult]:
+    """
+    Analyze many RCT articles in parallel worker processes.
+    
+    Args:
+        cards: RCT article data dictionaries
+        settings: Optional analysis settings applied to every card (leave
+            write_to_path unset, or every card writes the same file)
+        n_workers: Number of worker processes (default: CPU count)
+        
+    Returns:
+        List of AnalyzeResult, one per card (in input order)
+    """
+    if not cards:
+        return []
+    
+    analyze = functools.partial(analyze_rct, settings=settings)
+    with ProcessPoolExecutor(max_workers=n_workers or os.cpu_count()) as executor:
+        return list(executor.map(analyze, cards, chunksize=8))
+
+
 def main():
     """CLI entry point."""
     parser = argparse.ArgumentParser(description="Analyze RCT articles")
@@ -409,12 +496,22 @@ def main():
     
     args = parser.parse_args()
     
-    # Read input file
-    with open(args.input_file, 'r', encoding='utf-8') as f:
-        article = json.load(f)
+    # Read input file, parsing and validating in a single pydantic-core pass
+    raw = Path(args.input_file).read_bytes()
+    card_model = _get_models()[1]
+    if card_model is None:
+        # No pydantic: analyze the raw dict as before
+        article = json.loads(raw)
+    else:
+        try:
+            article = card_model.model_validate_json(raw).model_dump()
+        except ValueError:
+            # pydantic's ValidationError is a ValueError: analyze the
+            # invalid card's raw dict as before
+            article = json.loads(raw)
     
     # Analyze
-    result = analyze_rct(article, {"write_to_path": args.output_file})
+    result = analyze_rct(article, {"write_to_path": args.output_file}, validate=False)
     
     print(f"Analysis complete. Output written to {args.output_file}")
 
@@ -2,14 +2,268 @@
 Module for retrieving and parsing full-text articles from various sources.
 """
 
+import atexit
+import functools
+import hashlib
+import itertools
+import json
 import os
 import re
+import threading
 import time
 import requests
-from typing import Optional, Dict, Any, TypedDict
-from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator, List, Tuple, TypedDict
+from urllib.parse import quote, urljoin, urlparse
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 ( compatible; podcast-rct/1.0 )"
+
+
+# On-disk HTTP cache (used when requests-cache is installed); overridden by
+# settings["http_cache_path"] or the HTTP_CACHE_PATH environment variable
+DEFAULT_HTTP_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "podcast-rct", "http")
+
+# Besides successes, cache "not found"/paywalled answers so reruns over the
+# same DOIs don't spend a round trip per source rediscovering them
+HTTP_CACHE_CODES = (200, 301, 402, 403, 404, 410)
+
+# In-process cache of small non-PDF responses (see _make_request)
+RESPONSE_CACHE_MAXSIZE = 16384
+RESPONSE_CACHE_TTL = 600
+RESPONSE_CACHE_MAX_BYTES = 256 * 1024
+
+# Connect-phase timeout; settings["timeout_seconds"] bounds the read phase
+CONNECT_TIMEOUT_SECONDS = 5
+
+
+# Requests per second per host, after the services' published limits
+HOST_RATE_LIMITS = {
+    "api.crossref.org": 50,
+    "api.unpaywall.org": 5,
+    "www.ebi.ac.uk": 8,
+}
+DEFAULT_HOST_RATE_LIMIT = 10
+
+# Longest Retry-After (429/503) honoured before the single retry
+MAX_RETRY_AFTER_SECONDS = 30
+
+
+def _is_cacheable(response: requests.Response) -> bool:
+    """
+    Keep PDF bodies out of the HTTP cache; they are large and streamed.
+    """
+    return "application/pdf" not in response.headers.get("content-type", "")
+
+
+class _TokenBucket:
+    """
+    Token bucket allowing rate requests per second, in bursts of up to rate.
+    
+    Callers reserve a token even when none is left and sleep until it is
+    due, so concurrent waiters are spaced out instead of waking together.
+    """
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+_BUCKETS: Dict[str, _TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def _bucket_for(host: str) -> _TokenBucket:
+    """
+    Return the shared token bucket for a host, creating it on first use.
+    """
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(host)
+        if bucket is None:
+            bucket = _TokenBucket(HOST_RATE_LIMITS.get(host, DEFAULT_HOST_RATE_LIMIT))
+            _BUCKETS[host] = bucket
+        return bucket
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that spaces requests per host (see HOST_RATE_LIMITS).
+    
+    Adapters sit below requests-cache, so only requests that actually go to
+    the network wait for a token.
+    """
+    
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        _bucket_for(urlparse(request.url).hostname or "").acquire()
+        return super().send(request, **kwargs)
+
+
+class _Retry(Retry):
+    """
+    Retry policy that caps how long a Retry-After header can stall a thread.
+    """
+    
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAX_RETRY_AFTER_SECONDS)
+
+
+def _session(settings: Dict[str, Any]) -> requests.Session:
+    """
+    The shared HTTP session for the configured cache path.
+    """
+    cache_path = (
+        settings.get("http_cache_path")
+        or os.environ.get("HTTP_CACHE_PATH")
+        or DEFAULT_HTTP_CACHE_PATH
+    )
+    return _get_session(cache_path)
+
+
+@functools.cache
+def _get_session(cache_path: str) -> requests.Session:
+    """
+    Create the shared HTTP session on first use, so importing this module
+    opens no cache file and no connection pool.
+    """
+    session = _create_session(cache_path)
+    atexit.register(session.close)
+    return session
+
+
+def _create_session(cache_path: str) -> requests.Session:
+    """
+    Create the shared HTTP session.
+    
+    Connections are pooled per host and kept alive, so the repeated calls to
+    Europe PMC, Crossref and Unpaywall skip the TCP/TLS handshake; requests
+    that reach the network are rate-limited per host, and a 429 is retried
+    once after its Retry-After. With requests-cache installed, responses are
+    also cached on disk for a week.
+    """
+    if requests_cache is not None:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        session = requests_cache.CachedSession(
+            cache_path,
+            backend="sqlite",
+            expire_after=timedelta(days=7),
+            allowable_codes=HTTP_CACHE_CODES,
+            stale_if_error=True,
+            filter_fn=_is_cacheable
+        )
+    else:
+        session = requests.Session()
+    adapter = _RateLimitedAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=_Retry(
+            total=1,
+            connect=1,
+            read=1,
+            status_forcelist=[429, 502, 503, 504],
+            backoff_factor=0.3,
+            respect_retry_after_header=True
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = DEFAULT_USER_AGENT
+    return session
+
+
+# Default cap on downloaded PDF size (settings["max_pdf_bytes"])
+DEFAULT_MAX_PDF_BYTES = 50 * 1024 * 1024
+
+# Bytes read per chunk when streaming a PDF body
+PDF_CHUNK_SIZE = 64 * 1024
+
+# HEAD responses meaning "this server does not answer HEAD", not "no PDF here"
+HEAD_UNSUPPORTED_CODES = frozenset({403, 405, 501})
+
+# Full-text routes in priority order (settings["route_order"] overrides it;
+# settings["disabled_routes"] drops routes, including "abstract")
+DEFAULT_ROUTE_ORDER = ("pmc", "unpaywall", "europempc", "publisher")
+
+# DOIs per Crossref filter query in resolve_fulltext_batch
+CROSSREF_BATCH_SIZE = 40
+
+# Publisher hosts whose landing pages are a paywall without an institutional
+# proxy; the Crossref route skips them (settings["force_publisher_fetch"])
+_PAYWALL_HOSTS = frozenset({
+    "linkinghub.elsevier.com",
+    "www.sciencedirect.com",
+    "onlinelibrary.wiley.com",
+    "www.nature.com",
+    "journals.lww.com",
+    "link.springer.com",
+    "www.tandfonline.com",
+    "academic.oup.com",
+    "journals.sagepub.com",
+})
+
+# Identifier shapes; anything else is dropped before it reaches an API
+_DOI_RE = re.compile(r"^10\.\d{4,9}/\S+$")
+_PMID_RE = re.compile(r"^\d{1,9}$")
+
+# DOI resolver URLs say nothing about the publisher behind them
+_RESOLVER_RE = re.compile(r"^(?:dx\.)?doi\.org$")
+
+
+# Page chrome dropped from fetched HTML before it is stored. <header> is not
+# listed: inside an <article> it holds the title and byline, so only the
+# page-level header (PAGE_HEADER_SELECTOR) is dropped
+BOILERPLATE_TAGS = ["script", "style", "noscript", "nav", "footer", "aside"]
+PAGE_HEADER_SELECTOR = "body > header"
+
+# Article body containers in priority order; the first selector with a
+# match wins, whatever its position in the document
+CONTENT_SELECTORS = ("article", "div.jig-ncbiinpagenav", "main", "div#content")
+
+_BOILERPLATE_RE = re.compile(
+    r"<(%s)\b[^>]*>.*?</\1\s*>|<!--.*?-->" % "|".join(BOILERPLATE_TAGS),
+    re.IGNORECASE | re.DOTALL
+)
+_CONTENT_RE = re.compile(r"<(article|main)\b[^>]*>.*</\1\s*>", re.IGNORECASE | re.DOTALL)
+
 
 # Type definitions
+# (kind, url, result fields) found by a _probe_* function; kind is "pdf" or "html"
+Candidate = Tuple[str, str, Dict[str, Any]]
+
+
 class FullTextResult(TypedDict, total=False):
     route: str                 # "pmc"|"unpaywall"|"europempc"|"publisher"|"abstract"|"override"
     pmcid: Optional[str]
@@ -17,6 +271,7 @@ class FullTextResult(TypedDict, total=False):
     publisher_url: Optional[str]
     html: Optional[str]        # cleaned HTML string
     pdf_bytes: Optional[bytes] # raw PDF if fetched
+    pdf_path: Optional[str]    # PDF saved under settings["pdf_cache_dir"], instead of pdf_bytes
     abstract: Optional[str]
 
 
@@ -36,6 +291,67 @@ def resolve_fulltext(
     Returns:
         FullTextResult with retrieved content
     """
+    return _resolve_fulltext(doi, pmid, settings)
+
+
+def resolve_fulltext_batch(
+    items: List[Tuple[Optional[str], Optional[str]]], 
+    settings: Dict[str, Any]
+) -> List[Optional[FullTextResult]]:
+    """
+    Full-text retrieval for many articles.
+    
+    Crossref records for every DOI are fetched up front, CROSSREF_BATCH_SIZE
+    DOIs per filter query, instead of one /works/{doi} call per article. The
+    publisher hop is then only made for DOIs whose record carries an open
+    licence; DOIs Crossref does not know skip it too.
+    
+    Args:
+        items: (doi, pmid) pairs
+        settings: Analysis settings with retrieval options
+        
+    Returns:
+        One FullTextResult (or None) per item, in order
+    """
+    items = [_normalize_ids(doi, pmid) for doi, pmid in items]
+    
+    crossref = None
+    if settings.get("allow_network", True) and not settings.get("fulltext_override"):
+        crossref = _crossref_batch([doi for doi, _ in items if doi], settings)
+    
+    return [_resolve_fulltext(doi, pmid, settings, crossref) for doi, pmid in items]
+
+
+def _normalize_ids(
+    doi: Optional[str], 
+    pmid: Optional[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Strip and validate identifiers; malformed ones become None.
+    
+    DOIs are case-insensitive, so they are also lower-cased.
+    """
+    doi = doi.strip().lower() if doi else None
+    if doi and not _DOI_RE.match(doi):
+        doi = None
+    pmid = pmid.strip() if pmid else None
+    if pmid and not _PMID_RE.match(pmid):
+        pmid = None
+    return doi, pmid
+
+
+def _resolve_fulltext(
+    doi: Optional[str], 
+    pmid: Optional[str], 
+    settings: Dict[str, Any],
+    crossref: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+) -> Optional[FullTextResult]:
+    """
+    Shared body of resolve_fulltext and resolve_fulltext_batch.
+    
+    crossref maps lower-cased DOIs covered by _crossref_batch to their work
+    record (None when Crossref does not know the DOI).
+    """
     # If fulltext_override provided, use it (route="override")
     if settings.get("fulltext_override"):
         return {
@@ -47,251 +363,293 @@ def resolve_fulltext(
     if not settings.get("allow_network", True):
         return None
     
-    # Try retrieval in order
-    # 1. PubMed Central (PMC) via PMCID or via Europe PMC
-    result = _fetch_pmc(doi, pmid, None, settings)
-    if result:
-        return result
+    # Malformed identifiers would only cost round trips with no results
+    doi, pmid = _normalize_ids(doi, pmid)
+    if not doi and not pmid:
+        return None
     
-    # 2. Unpaywall (requires unpaywall_email)
-    if settings.get("unpaywall_email"):
-        result = _fetch_unpaywall(doi, settings)
-        if result:
-            return result
+    # Probes for the routes that apply to this article
+    routes = {
+        "pmc": (_probe_pmc, (doi, pmid, settings)),
+        "europempc": (_probe_europe_pmc, (doi, pmid, settings))
+    }
     
-    # 3. Europe PMC REST API
-    result = _fetch_europe_pmc(doi, pmid, settings)
-    if result:
-        return result
+    # Unpaywall (requires unpaywall_email)
+    if doi and settings.get("unpaywall_email"):
+        routes["unpaywall"] = (_probe_unpaywall, (doi, settings))
     
-    # 4. Crossref (DOI → publisher landing page)
+    # Crossref (DOI → publisher landing page)
     if doi:
-        result = _fetch_crossref(doi, settings)
-        if result:
-            return result
+        if crossref is not None and doi.lower() in crossref:
+            message = crossref[doi.lower()]
+            if message is not None and _is_open_licensed(message):
+                routes["publisher"] = (_probe_crossref, (doi, settings, message))
+        else:
+            routes["publisher"] = (_probe_crossref, (doi, settings))
     
-    # 5. Fallback to abstract if allowed
-    if settings.get("abstract_only_ok", True):
-        result = _fetch_abstract(doi, pmid, settings)
-        if result:
-            return result
+    # Candidate sources in priority order, minus any disabled in settings
+    disabled = set(settings.get("disabled_routes", ()))
+    order = settings.get("route_order", DEFAULT_ROUTE_ORDER)
+    probes = [routes[name] for name in order if name in routes and name not in disabled]
+    
+    # Run the metadata probes (and the abstract fallback) concurrently, so
+    # the wall time is bounded by the slowest probe that has to be waited on
+    # instead of the sum of all of them. Downloads then run one at a time in
+    # priority order: bandwidth goes to the best candidate rather than being
+    # split with PDFs that would be thrown away.
+    executor = ThreadPoolExecutor(max_workers=len(probes) + 1)
+    try:
+        abstract = None
+        if settings.get("abstract_only_ok", True) and "abstract" not in disabled:
+            abstract = executor.submit(_fetch_abstract, doi, pmid, settings)
+        futures = [executor.submit(probe, *args) for probe, args in probes]
+        
+        tried = set()
+        for future in futures:
+            for candidate in future.result():
+                # PMC and Europe PMC often point at the same URLs
+                if candidate[1] in tried:
+                    continue
+                tried.add(candidate[1])
+                result = _download(candidate, settings)
+                if result:
+                    return result
+        
+        # Fallback to abstract if allowed
+        if abstract is not None:
+            return abstract.result()
+    finally:
+        # Don't wait for lower-priority lookups still in flight
+        executor.shutdown(wait=False, cancel_futures=True)
     
     return None
 
 
-def _fetch_pmc(
-    doi: Optional[str], 
-    pmid: Optional[str], 
-    pmcid: Optional[str],
+def _download(
+    candidate: Candidate, 
     settings: Dict[str, Any]
 ) -> Optional[FullTextResult]:
     """
-    Fetch from PubMed Central.
-    
-    Tries direct PMCID access first, then queries Europe PMC to get PMCID.
+    Fetch the body of a candidate found by one of the _probe_* functions.
     """
-    try:
-        # If we already have PMCID, try direct access
-        if pmcid:
-            # Try to fetch PDF first
-            pdf_url = f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/pdf/"
-            response = _make_request(pdf_url, settings, "application/pdf")
-            if response and response.status_code == 200:
-                return {
-                    "route": "pmc",
-                    "pmcid": pmcid,
-                    "oa_pdf_url": pdf_url,
-                    "pdf_bytes": response.content
-                }
-            
-            # Try HTML version
-            html_url = f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/"
-            response = _make_request(html_url, settings, "text/html")
-            if response and response.status_code == 200:
-                return {
-                    "route": "pmc",
-                    "pmcid": pmcid,
-                    "html": response.text
-                }
+    kind, url, fields = candidate
+    if kind == "pdf":
+        # With a pdf_cache_dir, PDFs go to disk instead of staying in memory
+        if settings.get("pdf_cache_dir"):
+            pdf_path = _save_pdf(url, settings)
+            if pdf_path:
+                return {**fields, "pdf_path": pdf_path}
+            return None
         
-        # If we don't have PMCID, try to get it from identifiers
-        pmcid_from_identifiers = _get_pmcid_from_identifiers(doi, pmid, settings)
-        if pmcid_from_identifiers:
-            return _fetch_pmc(doi, pmid, pmcid_from_identifiers, settings)
-            
-    except Exception as e:
-        # Silently fail and let other methods try
-        pass
+        pdf_bytes = _fetch_pdf(url, settings)
+        if pdf_bytes:
+            return {**fields, "pdf_bytes": pdf_bytes}
+        return None
     
+    response = _make_request(url, settings, "text/html")
+    if response and response.status_code == 200:
+        return {**fields, "html": _strip_boilerplate(response.text)}
     return None
 
 
-def _fetch_unpaywall(
+def _pmc_candidates(pmcid: str) -> List[Candidate]:
+    """
+    PDF then HTML article URLs for a PMCID.
+    """
+    pdf_url = f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/pdf/"
+    html_url = f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/"
+    return [
+        ("pdf", pdf_url, {"route": "pmc", "pmcid": pmcid, "oa_pdf_url": pdf_url}),
+        ("html", html_url, {"route": "pmc", "pmcid": pmcid})
+    ]
+
+
+def _probe_pmc(
+    doi: Optional[str], 
+    pmid: Optional[str], 
+    settings: Dict[str, Any]
+) -> List[Candidate]:
+    """
+    Find PubMed Central URLs.
+    
+    The PMCID is resolved once (see _resolve_pmcid) and its two article URLs
+    returned; nothing here re-enters the resolver. The Europe PMC probe adds
+    the same URLs from its own result, and resolve_fulltext skips repeats.
+    """
+    pmcid = _resolve_pmcid(doi, pmid, settings)
+    return _pmc_candidates(pmcid) if pmcid else []
+
+
+def _probe_unpaywall(
     doi: str, 
     settings: Dict[str, Any]
-) -> Optional[FullTextResult]:
+) -> List[Candidate]:
     """
-    Fetch from Unpaywall API.
+    Find OA URLs with the Unpaywall API.
     
     Requires unpaywall_email in settings.
     """
+    candidates = []
     try:
         email = settings.get("unpaywall_email")
         if not email:
-            return None
+            return []
         
         # Construct Unpaywall API URL
-        url = f"https://api.unpaywall.org/v2/{doi}"
+        url = f"https://api.unpaywall.org/v2/{quote(doi, safe='')}"
         params = {"email": email}
         
-        response = _make_request(url, settings)
+        response = _make_request(url, settings, params=params)
         if response and response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             
             # Check for best OA location
             best_oa_location = data.get("best_oa_location")
             if best_oa_location:
                 pdf_url = best_oa_location.get("pdf_url")
                 if pdf_url:
-                    # Fetch the PDF
-                    pdf_response = _make_request(pdf_url, settings, "application/pdf")
-                    if pdf_response and pdf_response.status_code == 200:
-                        return {
-                            "route": "unpaywall",
-                            "oa_pdf_url": pdf_url,
-                            "pdf_bytes": pdf_response.content
-                        }
+                    candidates.append(
+                        ("pdf", pdf_url, {"route": "unpaywall", "oa_pdf_url": pdf_url})
+                    )
                 
                 # Fallback to URL if PDF not available
                 url = best_oa_location.get("url")
                 if url:
-                    html_response = _make_request(url, settings, "text/html")
-                    if html_response and html_response.status_code == 200:
-                        return {
-                            "route": "unpaywall",
-                            "publisher_url": url,
-                            "html": html_response.text
-                        }
+                    candidates.append(
+                        ("html", url, {"route": "unpaywall", "publisher_url": url})
+                    )
     except Exception as e:
         # Silently fail and let other methods try
         pass
     
-    return None
+    return candidates
 
 
-def _fetch_europe_pmc(
+def _probe_europe_pmc(
     doi: Optional[str], 
     pmid: Optional[str], 
     settings: Dict[str, Any]
-) -> Optional[FullTextResult]:
+) -> List[Candidate]:
     """
-    Fetch from Europe PMC REST API.
+    Find full-text URLs with the Europe PMC REST API.
     """
+    candidates = []
     try:
-        # Build query
-        query = ""
-        if doi:
-            query = f"DOI:{doi}"
-        elif pmid:
-            query = f"EXT_ID:{pmid}"
-        else:
-            return None
-        
-        # Europe PMC API URL
-        url = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
-        params = {
-            "query": query,
-            "resultType": "core",
-            "format": "json"
-        }
-        
-        response = _make_request(url, settings)
-        if response and response.status_code == 200:
-            data = response.json()
+        result = _europepmc_search(doi, pmid, settings)
+        if result:
+            pmcid = result.get("pmcid")
             
-            # Check if we have results
-            results = data.get("resultList", {}).get("result", [])
-            if results:
-                result = results[0]
-                pmcid = result.get("pmcid")
-                
-                # Try to get full text links
-                full_text_links = result.get("fullTextUrlList", {}).get("fullTextUrl", [])
-                for link in full_text_links:
-                    doc_type = link.get("documentType")
-                    if doc_type == "pdf":
-                        pdf_url = link.get("url")
-                        if pdf_url:
-                            # Fetch the PDF
-                            pdf_response = _make_request(pdf_url, settings, "application/pdf")
-                            if pdf_response and pdf_response.status_code == 200:
-                                return {
-                                    "route": "europempc",
-                                    "pmcid": pmcid,
-                                    "oa_pdf_url": pdf_url,
-                                    "pdf_bytes": pdf_response.content
-                                }
-                    elif doc_type == "html":
-                        html_url = link.get("url")
-                        if html_url:
-                            html_response = _make_request(html_url, settings, "text/html")
-                            if html_response and html_response.status_code == 200:
-                                return {
-                                    "route": "europempc",
-                                    "pmcid": pmcid,
-                                    "html": html_response.text
-                                }
-                
-                # If we have PMCID, try PMC directly
-                if pmcid:
-                    return _fetch_pmc(doi, pmid, pmcid, settings)
+            # Try to get full text links
+            full_text_links = result.get("fullTextUrlList", {}).get("fullTextUrl", [])
+            for link in full_text_links:
+                doc_type = link.get("documentType")
+                url = link.get("url")
+                if not url:
+                    continue
+                if doc_type == "pdf":
+                    candidates.append(
+                        ("pdf", url, {"route": "europempc", "pmcid": pmcid, "oa_pdf_url": url})
+                    )
+                elif doc_type == "html":
+                    candidates.append(("html", url, {"route": "europempc", "pmcid": pmcid}))
+            
+            # If we have PMCID, try PMC directly
+            if pmcid:
+                candidates.extend(_pmc_candidates(pmcid))
     except Exception as e:
         # Silently fail and let other methods try
         pass
     
-    return None
+    return candidates
 
 
-def _fetch_crossref(
+def _probe_crossref(
     doi: str, 
-    settings: Dict[str, Any]
-) -> Optional[FullTextResult]:
+    settings: Dict[str, Any],
+    message: Optional[Dict[str, Any]] = None
+) -> List[Candidate]:
     """
-    Fetch from Crossref and publisher landing page.
+    Find the publisher landing page with Crossref.
+    
+    A Crossref work record already fetched by resolve_fulltext_batch can be
+    passed as message to skip the per-DOI API call.
     """
     try:
-        # Crossref API URL
-        url = f"https://api.crossref.org/works/{doi}"
-        
-        response = _make_request(url, settings)
-        if response and response.status_code == 200:
-            data = response.json()
+        if message is None:
+            # Crossref API URL
+            url = f"https://api.crossref.org/works/{quote(doi, safe='')}"
             
-            # Get publisher URL
-            publisher_url = data.get("message", {}).get("url")
-            if publisher_url:
-                # Try to get HTML content
-                html_response = _make_request(publisher_url, settings, "text/html")
-                if html_response and html_response.status_code == 200:
-                    # Check if it's a PDF
-                    content_type = html_response.headers.get("content-type", "")
-                    if "application/pdf" in content_type:
-                        return {
-                            "route": "publisher",
-                            "publisher_url": publisher_url,
-                            "pdf_bytes": html_response.content
-                        }
-                    else:
-                        return {
-                            "route": "publisher",
-                            "publisher_url": publisher_url,
-                            "html": html_response.text
-                        }
+            response = _make_request(url, settings)
+            if not response or response.status_code != 200:
+                return []
+            message = _json(response).get("message", {})
+        
+        # Get publisher URL
+        publisher_url = message.get("url")
+        if publisher_url and not settings.get("force_publisher_fetch"):
+            # Classify resolver URLs by the landing page Crossref records
+            host = urlparse(publisher_url).netloc.lower()
+            if _RESOLVER_RE.match(host):
+                primary_url = message.get("resource", {}).get("primary", {}).get("URL", "")
+                host = urlparse(primary_url).netloc.lower()
+            if host in _PAYWALL_HOSTS:
+                return []
+        
+        if publisher_url:
+            return [("html", publisher_url, {"route": "publisher", "publisher_url": publisher_url})]
     except Exception as e:
         # Silently fail and let other methods try
         pass
     
-    return None
+    return []
+
+
+def _crossref_batch(
+    dois: List[str], 
+    settings: Dict[str, Any]
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Fetch Crossref work records for many DOIs with filter=doi:... queries.
+    
+    Returns a dict keyed by lower-cased DOI. DOIs in a chunk that succeeded
+    but Crossref did not return map to None; DOIs in failed chunks (or with
+    commas, which the filter syntax can't express) are left out so callers
+    fall back to the per-DOI lookup.
+    """
+    unique = list(dict.fromkeys(doi.lower() for doi in dois if "," not in doi))
+    records: Dict[str, Optional[Dict[str, Any]]] = {}
+    
+    # Chunked to keep the query string clear of 414 URI Too Long
+    for start in range(0, len(unique), CROSSREF_BATCH_SIZE):
+        chunk = unique[start:start + CROSSREF_BATCH_SIZE]
+        params = {
+            "filter": ",".join(f"doi:{doi}" for doi in chunk),
+            "rows": len(chunk)
+        }
+        response = _make_request("https://api.crossref.org/works", settings, params=params)
+        if not response or response.status_code != 200:
+            continue
+        try:
+            found = _json(response).get("message", {}).get("items", [])
+        except ValueError:
+            continue
+        
+        records.update(dict.fromkeys(chunk))
+        for item in found:
+            if item.get("DOI"):
+                records[item["DOI"].lower()] = item
+    
+    return records
+
+
+def _is_open_licensed(message: Dict[str, Any]) -> bool:
+    """
+    Whether a Crossref work record carries a Creative Commons licence.
+    """
+    return any(
+        "creativecommons.org" in entry.get("URL", "") 
+        for entry in message.get("license", [])
+    )
 
 
 def _fetch_abstract(
@@ -304,36 +662,14 @@ def _fetch_abstract(
     """
     try:
         # Try Europe PMC for abstract
-        query = ""
-        if doi:
-            query = f"DOI:{doi}"
-        elif pmid:
-            query = f"EXT_ID:{pmid}"
-        else:
-            return None
-        
-        # Europe PMC API URL for abstract
-        url = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
-        params = {
-            "query": query,
-            "resultType": "core",
-            "format": "json"
-        }
-        
-        response = _make_request(url, settings)
-        if response and response.status_code == 200:
-            data = response.json()
-            
-            # Check if we have results
-            results = data.get("resultList", {}).get("result", [])
-            if results:
-                result = results[0]
-                abstract = result.get("abstractText")
-                if abstract:
-                    return {
-                        "route": "abstract",
-                        "abstract": abstract
-                    }
+        result = _europepmc_search(doi, pmid, settings)
+        if result:
+            abstract = result.get("abstractText")
+            if abstract:
+                return {
+                    "route": "abstract",
+                    "abstract": abstract
+                }
     except Exception as e:
         # Silently fail
         pass
@@ -341,79 +677,446 @@ def _fetch_abstract(
     return None
 
 
+def _strip_boilerplate(html: str) -> str:
+    """
+    Reduce a fetched page to its article container, minus scripts and chrome.
+    
+    Keeps the result as HTML for text_clean, but drops the navigation, page
+    header and inline scripts that make up most of a publisher page. Uses
+    selectolax when installed, else a regex pass.
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        tree.strip_tags(BOILERPLATE_TAGS)
+        for header in tree.css(PAGE_HEADER_SELECTOR):
+            header.decompose()
+        
+        # css_first on a selector list returns the first match in document
+        # order, so try each selector in turn to honour the priority
+        node = next(
+            (match for match in map(tree.css_first, CONTENT_SELECTORS) if match is not None),
+            tree.body
+        )
+        return node.html if node is not None else html
+    
+    html = _BOILERPLATE_RE.sub("", html)
+    match = _CONTENT_RE.search(html)
+    return match.group(0) if match else html
+
+
+def _json(response: requests.Response) -> Any:
+    """
+    Decode a JSON response body, with orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _request_headers(settings: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """
+    Per-request headers: a User-Agent override from settings or environment
+    (the session already sends the default one).
+    """
+    user_agent = settings.get("user_agent") or os.environ.get("HTTP_USER_AGENT")
+    return {"User-Agent": user_agent} if user_agent else None
+
+
+def _request_timeout(settings: Dict[str, Any]) -> Tuple[float, float]:
+    """
+    (connect, read) timeout, so a stuck connect can't use up the read budget.
+    """
+    return (CONNECT_TIMEOUT_SECONDS, settings.get("timeout_seconds", 30))
+
+
+def _make_head_request(
+    url: str, 
+    settings: Dict[str, Any]
+) -> Optional[requests.Response]:
+    """
+    Make a HEAD request (following redirects) to inspect a URL's headers.
+    """
+    try:
+        return _session(settings).head(
+            url,
+            headers=_request_headers(settings),
+            timeout=_request_timeout(settings),
+            allow_redirects=True
+        )
+    except requests.RequestException:
+        # Silently fail; anything else is a bug and should surface
+        return None
+
+
+def _fetch_pdf(
+    url: str, 
+    settings: Dict[str, Any]
+) -> Optional[bytes]:
+    """
+    Download a PDF into memory (see _open_pdf).
+    """
+    opened = _open_pdf(url, settings)
+    if opened is None:
+        return None
+    response, chunks = opened
+    return _drain_pdf(response, settings.get("max_pdf_bytes", DEFAULT_MAX_PDF_BYTES), chunks)
+
+
+def _save_pdf(
+    url: str, 
+    settings: Dict[str, Any]
+) -> Optional[str]:
+    """
+    Download a PDF into settings["pdf_cache_dir"] and return its path.
+    
+    Files are named by the SHA-256 of their URL, so a PDF already on disk
+    is reused without a request. The body is streamed to a temporary file
+    and renamed into place once complete, so readers never see a partial PDF.
+    """
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    path = Path(settings["pdf_cache_dir"]) / f"{digest}.pdf"
+    if path.exists():
+        return str(path)
+    
+    opened = _open_pdf(url, settings)
+    if opened is None:
+        return None
+    response, chunks = opened
+    if chunks is None:
+        chunks = response.iter_content(PDF_CHUNK_SIZE)
+    
+    max_bytes = settings.get("max_pdf_bytes", DEFAULT_MAX_PDF_BYTES)
+    length = response.headers.get("content-length", "")
+    encoding = response.headers.get("content-encoding", "identity")
+    tmp_path = path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.part")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = 0
+        with tmp_path.open("wb") as f:
+            for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    return None
+                f.write(chunk)
+        # Truncated body (content-length counts encoded bytes, see _drain_pdf)
+        if length.isdigit() and encoding == "identity" and size != int(length):
+            return None
+        os.replace(tmp_path, path)
+        return str(path)
+    except (OSError, requests.RequestException):
+        return None
+    finally:
+        response.close()
+        tmp_path.unlink(missing_ok=True)
+
+
+def _open_pdf(
+    url: str, 
+    settings: Dict[str, Any]
+) -> Optional[Tuple[requests.Response, Optional[Iterator[bytes]]]]:
+    """
+    Open a streamed PDF download, probing it with HEAD first.
+    
+    Many "PDF" links redirect to HTML landing pages, so a HEAD answer that
+    is not a PDF, or is larger than max_pdf_bytes, skips the download. When
+    the server rejects HEAD, the body is streamed and kept only if it opens
+    with the %PDF- magic bytes.
+    
+    Returns the open response with the body chunks to read (None when none
+    have been read yet); the caller must drain or close the response.
+    """
+    max_bytes = settings.get("max_pdf_bytes", DEFAULT_MAX_PDF_BYTES)
+    
+    head = _make_head_request(url, settings)
+    if head is not None and head.status_code not in HEAD_UNSUPPORTED_CODES:
+        if head.status_code != 200:
+            return None
+        if "application/pdf" not in head.headers.get("content-type", ""):
+            return None
+        content_length = head.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            return None
+        
+        response = _make_request(url, settings, "application/pdf")
+        if response and response.status_code == 200:
+            return response, None
+        _release(response)
+        return None
+    
+    # HEAD not supported: sniff the first chunk of a streamed GET instead
+    response = _make_request(url, settings, stream=True)
+    if not response or response.status_code != 200:
+        _release(response)
+        return None
+    try:
+        chunks = response.iter_content(PDF_CHUNK_SIZE)
+        first = next(chunks, b"")
+    except requests.RequestException:
+        response.close()
+        return None
+    if not first.startswith(b"%PDF-"):
+        response.close()
+        return None
+    return response, itertools.chain((first,), chunks)
+
+
+def _release(response: Optional[requests.Response]) -> None:
+    """
+    Close an unread streamed response so its connection goes back to the pool.
+    
+    An unconsumed streamed body pins its connection until garbage collection,
+    which starves the per-host pool when many lookups run concurrently.
+    """
+    if response is not None:
+        response.close()
+
+
+def _drain_pdf(
+    response: requests.Response, 
+    max_bytes: int,
+    chunks: Optional[Iterator[bytes]] = None
+) -> Optional[bytes]:
+    """
+    Read a streamed PDF body into one buffer and close the response.
+    
+    With a usable content-length the buffer is allocated once and filled in
+    place; otherwise 64 KiB chunks are appended. Bodies over max_bytes, or
+    shorter than their declared length, are rejected as soon as detected.
+    """
+    if chunks is None:
+        chunks = response.iter_content(PDF_CHUNK_SIZE)
+    
+    # content-length counts encoded bytes, so it only sizes identity bodies
+    length = response.headers.get("content-length", "")
+    encoding = response.headers.get("content-encoding", "identity")
+    try:
+        if length.isdigit() and encoding == "identity":
+            size = int(length)
+            if size > max_bytes:
+                return None
+            buf = bytearray(size)
+            view = memoryview(buf)
+            pos = 0
+            for chunk in chunks:
+                end = pos + len(chunk)
+                if end > size:
+                    return None
+                view[pos:end] = chunk
+                pos = end
+            view.release()
+            if pos != size:
+                return None
+        else:
+            buf = bytearray()
+            for chunk in chunks:
+                buf += chunk
+                if len(buf) > max_bytes:
+                    return None
+        return bytes(buf)
+    except requests.RequestException:
+        return None
+    finally:
+        response.close()
+
+
 def _make_request(
     url: str, 
     settings: Dict[str, Any],
-    expected_content_type: Optional[str] = None
+    expected_content_type: Optional[str] = None,
+    stream: bool = False,
+    params: Optional[Dict[str, Any]] = None
 ) -> Optional[requests.Response]:
     """
     Make HTTP request with appropriate headers and timeout.
+    
+    Small non-PDF successes are kept in memory for RESPONSE_CACHE_TTL
+    seconds, so repeat lookups within a run skip the network entirely.
     """
     try:
-        # Get timeout from settings or default to 30 seconds
-        timeout = settings.get("timeout_seconds", 30)
+        response = None
+        key = None
+        if not stream and expected_content_type != "application/pdf":
+            key = (url, tuple(sorted(params.items())) if params else ())
+            response = _response_cache_get(key)
         
-        # Get user agent from settings or environment
-        user_agent = settings.get("user_agent") or os.environ.get("HTTP_USER_AGENT")
-        if not user_agent:
-            user_agent = "Mozilla/5.0 ( compatible; podcast-rct/1.0 )"
-        
-        headers = {
-            "User-Agent": user_agent
-        }
-        
-        # Make request
-        response = requests.get(url, headers=headers, timeout=timeout)
+        if response is None:
+            # Make request; PDFs are always streamed so a content-type
+            # mismatch is detected before the body is downloaded (see _drain_pdf)
+            response = _session(settings).get(
+                url,
+                params=params,
+                headers=_request_headers(settings),
+                timeout=_request_timeout(settings),
+                stream=stream or expected_content_type == "application/pdf"
+            )
+            if (
+                key is not None 
+                and response.status_code == 200 
+                and len(response.content) <= RESPONSE_CACHE_MAX_BYTES
+            ):
+                response = _CachedResponse(response)
+                _response_cache_put(key, response)
         
         # Check content type if specified
         if expected_content_type:
             content_type = response.headers.get("content-type", "")
             if expected_content_type not in content_type:
+                response.close()
                 return None
         
         return response
-    except Exception as e:
-        # Silently fail
+    except requests.RequestException:
+        # Silently fail; anything else is a bug and should surface
         return None
 
 
-def _get_pmcid_from_identifiers(
+class _CachedResponse:
+    """
+    Detached copy of a small response, safe to share between threads.
+    
+    Holds the body and headers only (no connection), and offers the subset
+    of requests.Response this module reads.
+    """
+    
+    def __init__(self, response: requests.Response):
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = response.url
+        self.content = response.content
+        self.encoding = response.encoding
+    
+    @functools.cached_property
+    def apparent_encoding(self) -> str:
+        # Charset detection is slow on large bodies, so it only runs when
+        # .text is read without a declared encoding
+        chardet = requests.compat.chardet
+        if chardet is None:
+            return "utf-8"
+        return chardet.detect(self.content)["encoding"] or "utf-8"
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or self.apparent_encoding, errors="replace")
+    
+    def json(self) -> Any:
+        return json.loads(self.content)
+    
+    def close(self) -> None:
+        pass
+
+
+_RESPONSE_CACHE: "OrderedDict[Tuple[str, Tuple], Tuple[float, _CachedResponse]]" = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _response_cache_get(key: Tuple[str, Tuple]) -> Optional[_CachedResponse]:
+    """
+    Return the cached response for key unless it has expired.
+    """
+    with _RESPONSE_CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _RESPONSE_CACHE[key]
+            return None
+        _RESPONSE_CACHE.move_to_end(key)
+        return entry[1]
+
+
+def _response_cache_put(key: Tuple[str, Tuple], response: _CachedResponse) -> None:
+    """
+    Cache a response, evicting the least recently used beyond the size cap.
+    """
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE[key] = (time.monotonic() + RESPONSE_CACHE_TTL, response)
+        _RESPONSE_CACHE.move_to_end(key)
+        while len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAXSIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+
+
+def _resolve_pmcid(
     doi: Optional[str], 
     pmid: Optional[str], 
     settings: Dict[str, Any]
 ) -> Optional[str]:
     """
     Query Europe PMC to get PMCID from DOI or PMID.
+    
+    Backed by the memoized shared search, so later routes asking for the
+    same article don't repeat the request.
     """
     try:
-        # Build query
-        query = ""
-        if doi:
-            query = f"DOI:{doi}"
-        elif pmid:
-            query = f"EXT_ID:{pmid}"
-        else:
-            return None
-        
-        # Europe PMC API URL
-        url = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
-        params = {
-            "query": query,
-            "resultType": "core",
-            "format": "json"
-        }
-        
-        response = _make_request(url, settings)
-        if response and response.status_code == 200:
-            data = response.json()
-            
-            # Check if we have results
-            results = data.get("resultList", {}).get("result", [])
-            if results:
-                result = results[0]
-                return result.get("pmcid")
+        result = _europepmc_search(doi, pmid, settings)
+        if result:
+            return result.get("pmcid")
     except Exception as e:
         # Silently fail
         pass
     
-    return None
\ No newline at end of file
+    return None
+
+
+# Stripe of locks so concurrent lookups of the same article (see
+# resolve_fulltext) wait for one request instead of each missing the cache
+_EUROPEPMC_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def _europepmc_search(
+    doi: Optional[str], 
+    pmid: Optional[str], 
+    settings: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the first Europe PMC search result for a DOI or PMID.
+    
+    PMC, Europe PMC and abstract routes all need the same search, so the
+    parsed result is cached per article (see _europepmc_search_cached).
+    """
+    key = (doi, pmid, settings.get("user_agent"), settings.get("timeout_seconds", 30))
+    with _EUROPEPMC_LOCKS[hash(key) % len(_EUROPEPMC_LOCKS)]:
+        return _europepmc_search_cached(*key)
+
+
+@functools.lru_cache(maxsize=4096)
+def _europepmc_search_cached(
+    doi: Optional[str], 
+    pmid: Optional[str], 
+    user_agent: Optional[str],
+    timeout: float
+) -> Optional[Dict[str, Any]]:
+    """
+    Cached Europe PMC search keyed on hashable scalars.
+    
+    Request failures raise instead of returning None, so they are not cached.
+    """
+    # Build query (DOIs are quoted: their suffixes may contain query syntax)
+    query = ""
+    if doi:
+        query = f'DOI:"{doi}"'
+    elif pmid:
+        query = f"EXT_ID:{pmid} AND SRC:MED"
+    else:
+        return None
+    
+    # Europe PMC API URL. Only the first hit is read; "core" is needed
+    # because the Europe PMC and abstract routes read fullTextUrlList and
+    # abstractText from the same shared result
+    url = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
+    params = {
+        "query": query,
+        "resultType": "core",
+        "pageSize": 1,
+        "format": "json"
+    }
+    
+    settings = {"user_agent": user_agent, "timeout_seconds": timeout}
+    response = _make_request(url, settings, params=params)
+    if not response or response.status_code != 200:
+        raise requests.RequestException(f"Europe PMC search failed for {query}")
+    
+    data = _json(response)
+    
+    # Check if we have results
+    results = data.get("resultList", {}).get("result", [])
+    return results[0] if results else None
\ No newline at end of file
@@ -1,19 +1,57 @@
 """Text cleaning and sectioning utilities for full-text articles."""
 
+import bisect
+import functools
+import hashlib
+import itertools
+import json
+import math
+import os
 import re
-from typing import Dict, List, Optional, Tuple, TypedDict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, TypedDict, Union
 from pathlib import Path
 
+from . import _re_compat
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    etree = None
+
 try:
     from bs4 import BeautifulSoup
 except ImportError:
     BeautifulSoup = None
 
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
 try:
     import PyPDF2
 except ImportError:
     PyPDF2 = None
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 
 # Type definitions
 class SectionedText(TypedDict):
@@ -34,6 +72,20 @@ class ExcerptedText(TypedDict):
     conclusion: str
 
 
+# Bump when sectioning output changes, so cached sections are not reused
+SECTIONS_CACHE_VERSION = 1
+
+# Section names, in document order (the keys of both TypedDicts above)
+_SECTIONS = ("abstract", "introduction", "methods", "results", "discussion", "conclusion")
+
+
+def _empty_sections() -> SectionedText:
+    """
+    A fresh sections dict with every section empty.
+    """
+    return dict.fromkeys(_SECTIONS, "")
+
+
 # Section mapping configuration
 SECTION_SYNONYMS = {
     "abstract": ["abstract", "summary"],
@@ -51,10 +103,80 @@ KEY_TERMS = [
     "primary outcome", "secondary outcome", "hypothesis"
 ]
 
+# Share of the excerpt token budget per section, in percent
+TOKEN_BUDGET_PERCENT = {
+    "abstract": 10,
+    "introduction": 10,
+    "methods": 25,
+    "results": 35,
+    "discussion": 15,
+    "conclusion": 5
+}
+
+# Terms checked by detect_content_red_flags
+RED_FLAG_TERMS = [
+    "allocation", "random", "blinding", "masking", "small sample",
+    "precise estimate", "primary outcome", "outcome", "subgroup",
+    "predefined", "a priori"
+]
+
+# Precompiled patterns. Literal and markup patterns go through RE2 when it
+# is installed; ones relying on Unicode \s/\w/\d or lookaheads stay on re
+# Script and style elements, comments and any remaining tag, in one pass
+_MARKUP_RE = _re_compat.compile(
+    r'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|<!--.*?-->|<[^>]+>', re.DOTALL
+)
+_AD_CLASS_RES = [_re_compat.compile(ad_class, re.I) for ad_class in ["advertisement", "ad", "sidebar", "banner"]]
+
+# Every section synonym in one alternation, to reject body-text lines cheaply
+_SYNONYMS = {synonym for synonyms in SECTION_SYNONYMS.values() for synonym in synonyms}
+_SYNONYM_RE = _re_compat.compile('|'.join(re.escape(synonym) for synonym in sorted(_SYNONYMS, key=len, reverse=True)))
+_MAX_SYNONYM_LEN = max(len(synonym) for synonym in _SYNONYMS)
+
+# Exact header -> section lookup; the first section listing a synonym wins,
+# as in the loop in _map_section_headers ("summary" -> "abstract")
+_SYN_TO_CANON: Dict[str, str] = {}
+for _section, _synonyms in SECTION_SYNONYMS.items():
+    for _synonym in [_section, *_synonyms]:
+        _SYN_TO_CANON.setdefault(_synonym, _section)
+del _section, _synonyms, _synonym
+
+# lxml equivalents of the BeautifulSoup selectors and filters below
+_CONTENT_XPATHS = [
+    "//main",
+    "//article",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' article-content ')]",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' fulltext ')]",
+    "//*[@id='main-content']"
+]
+_DROP_TAGS = ["script", "style", "nav", "header", "footer", "aside"]
+_AD_XPATH = "descendant-or-self::*[re:test(@class, 'advertisement|ad|sidebar|banner', 'i')]"
+_EXSLT_NS = {"re": "http://exslt.org/regular-expressions"}
+
+_WORD_RE = re.compile(r'\w+')
+
+_LEADING_NUMBER_RE = re.compile(r'^\d+\s*')
+_TRAILING_CONTENT_RE = re.compile(r'\s*[:\-].*$')
+
+_HYPHENATED_RE = re.compile(r'(\w+)-\s*\n\s*(\w+)')
+_WHITESPACE_RE = re.compile(r'\s+')
+# A line break with the whitespace around it, i.e. line ends, line starts and blank lines
+_BLANK_LINE_RE = re.compile(r'\s*\n\s*')
+
+# Figure and table references share one line-bounded pass; captions run
+# to the next blank line, so they stay a separate (DOTALL) pass
+_FIGURE_TABLE_REF_RE = re.compile(r'(?:Figure|Table)\s+\d+[A-Za-z]?(?:\s*[:\-].*?)?(?=\n|$)', re.IGNORECASE)
+_CAPTION_RE = re.compile(r'(?:Fig\.|Figure|Table)\s*\d+[A-Za-z]?.*?(?=\n\n|$)', re.DOTALL | re.IGNORECASE)
+
+# Red-flag terms in one alternation; the lookahead lets matches overlap
+_RED_FLAG_TERMS_RE = re.compile('(?=(' + '|'.join(re.escape(term) for term in RED_FLAG_TERMS) + '))')
+
 
 def parse_and_section(
     html: Optional[str] = None,
-    pdf_bytes: Optional[bytes] = None
+    pdf_bytes: Optional[bytes] = None,
+    pdf_path: Optional[str] = None,
+    cache_dir: Optional[str] = None
 ) -> SectionedText:
     """
     Parse and section full-text content.
@@ -62,31 +184,153 @@ def parse_and_section(
     Args:
         html: HTML content to parse
         pdf_bytes: PDF bytes to parse
+        pdf_path: Path of a PDF file to parse
+        cache_dir: Optional directory of cached results, keyed by a hash of
+            the content, so identical inputs are only parsed once
         
     Returns:
         SectionedText with content organized by section
     """
-    # Initialize empty sections
-    sections: SectionedText = {
-        "abstract": "",
-        "introduction": "",
-        "methods": "",
-        "results": "",
-        "discussion": "",
-        "conclusion": ""
-    }
+    if cache_dir and (html or pdf_bytes or pdf_path):
+        return _cached_parse_and_section(html, pdf_bytes, pdf_path, Path(cache_dir))
     
+    return _parse_and_section(html, pdf_bytes, pdf_path)
+
+
+def _parse_and_section(
+    html: Optional[str],
+    pdf_bytes: Optional[bytes],
+    pdf_path: Optional[str]
+) -> SectionedText:
+    """
+    Section the first content given: HTML, then PDF bytes, then a PDF file.
+    """
     if html:
-        sections = _section_html_content(html)
-    elif pdf_bytes:
-        sections = _section_pdf_content(pdf_bytes)
+        return _section_html_content(html)
+    if pdf_bytes:
+        return _section_pdf_content(pdf_bytes)
+    if pdf_path:
+        return _section_pdf_content(pdf_path)
+    
+    # Nothing to parse: empty sections
+    return _empty_sections()
+
+
+def _cached_parse_and_section(
+    html: Optional[str],
+    pdf_bytes: Optional[bytes],
+    pdf_path: Optional[str],
+    cache_dir: Path
+) -> SectionedText:
+    """
+    parse_and_section through a content-addressed cache of JSON files.
+    
+    Entries are named by a hash of the content that would be parsed, its
+    parser and SECTIONS_CACHE_VERSION, so re-runs over the same articles
+    skip parsing.
+    Unreadable entries count as misses; failed writes are ignored.
+    """
+    # The parser in use is part of the key, as each extracts slightly
+    # different text (and a missing one only yields an error message)
+    if html:
+        kind = "lxml" if etree is not None else "bs4" if BeautifulSoup is not None else "regex"
+        content = html.encode("utf-8")
+    else:
+        kind = "pymupdf" if pymupdf is not None else "pypdf2" if PyPDF2 is not None else "none"
+        try:
+            content = pdf_bytes or Path(pdf_path).read_bytes()
+        except OSError:
+            return _parse_and_section(html, pdf_bytes, pdf_path)
+    
+    path = cache_dir / f"{_content_digest(kind, content)}.json"
+    try:
+        return _json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        pass
+    
+    sections = _parse_and_section(html, pdf_bytes, pdf_path)
+    
+    # Write to a temporary file and rename, so readers never see a partial entry
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.part")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(_json_dumps(sections))
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
     
     return sections
 
 
+def _content_digest(kind: str, content: bytes) -> str:
+    """
+    Hex digest naming a sections cache entry (xxh3 when installed, else BLAKE2b).
+    """
+    hasher = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    hasher.update(f"v{SECTIONS_CACHE_VERSION}:{kind}:".encode("ascii"))
+    hasher.update(content)
+    return hasher.hexdigest()
+
+
+def _json_loads(data: bytes):
+    """
+    Decode JSON bytes, with orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(value) -> bytes:
+    """
+    Encode a value as UTF-8 JSON bytes, with orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def parse_and_section_batch(
+    items: List[Tuple[Optional[str], ...]],
+    n_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None
+) -> List[SectionedText]:
+    """
+    Parse and section many articles in parallel worker processes.
+    
+    Args:
+        items: parse_and_section arguments per article, as
+            (html, pdf_bytes) or (html, pdf_bytes, pdf_path) tuples
+        n_workers: Number of worker processes (default: CPU count)
+        cache_dir: Optional sections cache directory (see parse_and_section)
+        
+    Returns:
+        List of SectionedText, one per item (in input order)
+    """
+    if not items:
+        return []
+    
+    n_workers = n_workers or os.cpu_count() or 1
+    chunksize = max(1, len(items) // (4 * n_workers))
+    parse = functools.partial(_parse_and_section_item, cache_dir=cache_dir)
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(parse, items, chunksize=chunksize))
+
+
+def _parse_and_section_item(
+    item: Tuple[Optional[str], ...],
+    cache_dir: Optional[str] = None
+) -> SectionedText:
+    """
+    Picklable per-item worker for parse_and_section_batch.
+    """
+    return parse_and_section(*item, cache_dir=cache_dir)
+
+
 def select_excerpts_for_prompt(
     sectioned_text: SectionedText,
-    max_tokens: int
+    max_tokens: int,
+    redundancy_penalty: float = 0.0
 ) -> ExcerptedText:
     """
     Select relevant excerpts from sectioned text within token budget.
@@ -94,6 +338,8 @@ def select_excerpts_for_prompt(
     Args:
         sectioned_text: Text organized by section
         max_tokens: Maximum tokens allowed for LLM prompt
+        redundancy_penalty: Score deducted per unit of similarity to excerpts
+            already picked (0 keeps the plain key-term ranking)
         
     Returns:
         ExcerptedText with selected content
@@ -102,20 +348,13 @@ def select_excerpts_for_prompt(
     token_allocation = _allocate_token_budget(max_tokens)
     
     # Select excerpts from each section
-    excerpted_text: ExcerptedText = {
-        "abstract": "",
-        "introduction": "",
-        "methods": "",
-        "results": "",
-        "discussion": "",
-        "conclusion": ""
-    }
+    excerpted_text: ExcerptedText = _empty_sections()
     
     for section_name, section_text in sectioned_text.items():
         if section_name in token_allocation:
             allocated_tokens = token_allocation[section_name]
             excerpted_text[section_name] = _select_excerpts_from_section(
-                section_text, allocated_tokens, KEY_TERMS
+                section_text, allocated_tokens, KEY_TERMS, redundancy_penalty
             )
     
     return excerpted_text
@@ -136,31 +375,43 @@ def detect_content_red_flags(sectioned_text: SectionedText) -> List[str]:
     """
     red_flags = []
     
+    # Tally every red-flag term in one scan per section
+    methods = _red_flag_term_counts(sectioned_text.get("methods", ""))
+    results = _red_flag_term_counts(sectioned_text.get("results", ""))
+    
     # Check for missing CONSORT elements
-    methods_text = sectioned_text.get("methods", "").lower()
-    if "allocation" not in methods_text and "random" in methods_text:
+    if not methods["allocation"] and methods["random"]:
         red_flags.append("Missing CONSORT element: allocation concealment not mentioned")
     
-    if "blinding" not in methods_text and "masking" not in methods_text:
+    if not methods["blinding"] and not methods["masking"]:
         red_flags.append("Missing CONSORT element: blinding procedures not described")
     
     # Check for very small N vs precision claims
     # This is a simplified check - in practice would need more sophisticated analysis
-    if "small sample" in methods_text and "precise estimate" in sectioned_text.get("results", "").lower():
+    if methods["small sample"] and results["precise estimate"]:
         red_flags.append("Potential inconsistency: small sample size with precise estimates claimed")
     
     # Check for multiple outcomes without hierarchy
-    results_text = sectioned_text.get("results", "").lower()
-    if results_text.count("outcome") > 3 and "primary outcome" not in results_text:
+    if results["outcome"] > 3 and not results["primary outcome"]:
         red_flags.append("Multiple outcomes reported without clear primary outcome designation")
     
     # Check for subgroup analyses without a priori plan
-    if "subgroup" in results_text and "predefined" not in results_text and "a priori" not in results_text:
+    if results["subgroup"] and not results["predefined"] and not results["a priori"]:
         red_flags.append("Subgroup analyses presented without stated a priori plan")
     
     return red_flags
 
 
+def _red_flag_term_counts(text: str) -> Counter:
+    """
+    Count occurrences of each red-flag term in lowercased text.
+    
+    Matches may overlap, so "primary outcome" also counts as an "outcome",
+    as separate substring tests would see it.
+    """
+    return Counter(match.group(1) for match in _RED_FLAG_TERMS_RE.finditer(text.lower()))
+
+
 # HTML parsing functions
 def _clean_html(html_content: str) -> str:
     """
@@ -169,42 +420,56 @@ def _clean_html(html_content: str) -> str:
     Uses beautifulsoup4 and readability-lxml style heuristics.
     """
     if BeautifulSoup is None:
-        # Fallback if BeautifulSoup not available
-        # Remove script and style elements
-        html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL)
-        # Remove HTML comments
-        html_content = re.sub(r'<!--.*?-->', '', html_content, flags=re.DOTALL)
-        # Extract text content
-        text = re.sub(r'<[^>]+>', '', html_content)
+        # Fallback if BeautifulSoup not available: strip script and style
+        # elements, comments and tags in a single scan
+        text = _MARKUP_RE.sub('', html_content)
         return _clean_whitespace(text)
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    return _soup_text(BeautifulSoup(html_content, 'html.parser'))
+
+
+def _soup_text(node) -> str:
+    """
+    Clean a parsed BeautifulSoup tree (or subtree) in place and return its text.
+    """
+    # An ad/sidebar container is dropped whole, contents included
+    if any(ad_class_re.search(c) for ad_class_re in _AD_CLASS_RES for c in node.get('class') or []):
+        return ""
     
     # Remove script and style elements
-    for script in soup(["script", "style"]):
+    for script in node(["script", "style"]):
         script.decompose()
     
     # Remove navigation elements
-    for nav in soup.find_all(["nav", "header", "footer", "aside"]):
+    for nav in node.find_all(["nav", "header", "footer", "aside"]):
         nav.decompose()
     
     # Remove ads and sidebars
-    for ad_class in ["advertisement", "ad", "sidebar", "banner"]:
-        for element in soup.find_all(class_=re.compile(ad_class, re.I)):
+    for ad_class_re in _AD_CLASS_RES:
+        for element in node.find_all(class_=ad_class_re):
             element.decompose()
     
     # Extract text content
-    text = soup.get_text()
+    text = node.get_text()
     
     # Clean whitespace
     return _clean_whitespace(text)
 
 
-def _extract_main_content(html_content: str) -> str:
+def _html_to_text(html_content: str) -> str:
     """
-    Extract main article content from HTML.
+    Extract the cleaned main-content text from HTML in a single parse.
+    
+    The content container is located, filtered and read in the same tree,
+    with lxml when installed, else BeautifulSoup, else regexes.
     """
+    if etree is not None:
+        try:
+            return _lxml_main_text(html_content)
+        except (etree.ParserError, ValueError):
+            # Empty documents, or strings with an XML encoding declaration
+            pass
+    
     if BeautifulSoup is None:
         return _clean_html(html_content)
     
@@ -219,14 +484,45 @@ def _extract_main_content(html_content: str) -> str:
         if main_content:
             break
     
-    # If not found, use body content
+    # If not found, use body content (or the whole document for fragments)
     if not main_content:
-        main_content = soup.find('body')
+        main_content = soup.find('body') or soup
     
-    if main_content:
-        return _clean_html(str(main_content))
-    else:
-        return _clean_html(html_content)
+    return _soup_text(main_content)
+
+
+def _lxml_main_text(html_content: str) -> str:
+    """
+    Main-content text via lxml, in a single parse.
+    
+    Same container choice and filtering as the BeautifulSoup path (first of
+    main, article, .article-content, .fulltext, #main-content, else body;
+    chrome and ad/sidebar elements dropped), but elements are removed in the
+    C tree and the text is read straight from it, without re-serializing and
+    re-parsing the container.
+    """
+    root = lxml.html.document_fromstring(html_content)
+    
+    # Try to find main content area
+    node = None
+    for xpath in _CONTENT_XPATHS:
+        found = root.xpath(xpath)
+        if found:
+            node = found[0]
+            break
+    if node is None:
+        node = root.body if root.find('body') is not None else root
+    
+    # Remove script, style and navigation elements (keeping following text)
+    etree.strip_elements(node, *_DROP_TAGS, with_tail=False)
+    
+    # Remove ads and sidebars
+    for element in node.xpath(_AD_XPATH, namespaces=_EXSLT_NS):
+        if element is node:
+            return ""
+        element.drop_tree()
+    
+    return _clean_whitespace(node.text_content())
 
 
 def _section_html_content(html_content: str) -> SectionedText:
@@ -234,147 +530,134 @@ def _section_html_content(html_content: str) -> SectionedText:
     Section HTML content into standard sections.
     """
     # Extract main content
-    text = _extract_main_content(html_content)
+    text = _html_to_text(html_content)
     
-    # Identify section headers and their positions
-    section_headers = _identify_section_headers(text)
+    return _section_text(text)
+
+
+def _section_text(text: str) -> SectionedText:
+    """
+    Split text into standard sections in a single pass over its lines.
     
+    Header lines switch the current section; each run of content lines is
+    recorded as a (section, start, end) offset range and sliced out of the
+    text once at the end, so no per-line lists are built. A later run for
+    the same section replaces an earlier one.
+    """
     # Initialize sections
-    sections: SectionedText = {
-        "abstract": "",
-        "introduction": "",
-        "methods": "",
-        "results": "",
-        "discussion": "",
-        "conclusion": ""
-    }
-    
-    # Extract content for each section
-    section_names = list(sections.keys())
-    text_lines = text.split('\n')
+    sections = _empty_sections()
     
+    boundaries = []
     current_section = "abstract"  # Default to abstract
-    current_content = []
-    
-    for line in text_lines:
-        # Check if line is a section header
-        header_match = _map_section_headers(line.strip())
+    content_start = content_end = None
+    
+    pos = 0
+    length = len(text)
+    while True:
+        end = text.find('\n', pos)
+        if end == -1:
+            end = length
+        
+        # Check if line is a section header. A blank line maps to "abstract"
+        # (the empty string is part of every synonym), without the regexes.
+        line = text[pos:end].strip()
+        header_match = _map_section_headers(line) if line else "abstract"
         if header_match:
-            # Save previous section content
-            if current_content:
-                sections[current_section] = '\n'.join(current_content).strip()
-                current_content = []
+            # Close the previous section's run of content lines
+            if content_start is not None:
+                boundaries.append((current_section, content_start, content_end))
+                content_start = None
             
             # Update current section
             current_section = header_match
         else:
-            # Add line to current section
-            current_content.append(line)
+            # Extend the current run to cover this line
+            if content_start is None:
+                content_start = pos
+            content_end = end
+        
+        if end == length:
+            break
+        pos = end + 1
+    
+    # Close the final section's run
+    if content_start is not None:
+        boundaries.append((current_section, content_start, content_end))
     
-    # Save final section content
-    if current_content:
-        sections[current_section] = '\n'.join(current_content).strip()
+    for section, start, end in boundaries:
+        sections[section] = text[start:end].strip()
     
     return sections
 
 
 # PDF parsing functions
-def _extract_pdf_text(pdf_bytes: bytes, max_pages: int = 40) -> str:
+def _extract_pdf_text(pdf: Union[bytes, str], max_pages: int = 40) -> str:
     """
-    Extract text from PDF bytes.
+    Extract text from PDF bytes or a PDF file path.
     
-    Uses PyPDF2 for text extraction.
+    Uses PyMuPDF when installed (C-backed, much faster), else PyPDF2.
     """
+    if pymupdf is not None:
+        return _mupdf_text(pdf, max_pages)
+    
     if PyPDF2 is None:
         return "PDF parsing not available (PyPDF2 not installed)"
     
     try:
-        # Convert bytes to file-like object
-        from io import BytesIO
-        pdf_file = BytesIO(pdf_bytes)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text_parts = []
+        # Convert bytes to file-like object; files are read through an open
+        # handle so PdfReader seeks into them instead of loading them whole
+        if isinstance(pdf, bytes):
+            from io import BytesIO
+            pdf_file = BytesIO(pdf)
+        else:
+            pdf_file = open(pdf, 'rb')
         
-        # Extract text from pages up to max_pages
-        for i in range(min(len(pdf_reader.pages), max_pages)):
-            page = pdf_reader.pages[i]
-            text_parts.append(page.extract_text())
+        with pdf_file:
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            text_parts = []
+            
+            # Extract text from pages up to max_pages
+            for i in range(min(len(pdf_reader.pages), max_pages)):
+                page = pdf_reader.pages[i]
+                text_parts.append(page.extract_text())
         
         return '\n'.join(text_parts)
     except Exception as e:
         return f"Error extracting PDF text: {str(e)}"
 
 
-def _section_pdf_content(pdf_bytes: bytes, max_pages: int = 40) -> SectionedText:
+def _mupdf_text(pdf: Union[bytes, str], max_pages: int) -> str:
     """
-    Section PDF text into standard sections.
+    Extract text from PDF bytes or a PDF file path with PyMuPDF.
     """
-    # Extract text from PDF
-    text = _extract_pdf_text(pdf_bytes, max_pages)
-    
-    # For PDF content, we'll use a simpler approach since we don't have HTML structure
-    # Initialize sections
-    sections: SectionedText = {
-        "abstract": "",
-        "introduction": "",
-        "methods": "",
-        "results": "",
-        "discussion": "",
-        "conclusion": ""
-    }
-    
-    # Split text into lines for processing
-    text_lines = text.split('\n')
-    
-    current_section = "abstract"  # Default to abstract
-    current_content = []
-    
-    for line in text_lines:
-        line = line.strip()
-        if line:
-            # Check if line is a section header
-            header_match = _map_section_headers(line)
-            if header_match:
-                # Save previous section content
-                if current_content:
-                    sections[current_section] = '\n'.join(current_content).strip()
-                    current_content = []
-                
-                # Update current section
-                current_section = header_match
-            else:
-                # Add line to current section
-                current_content.append(line)
-    
-    # Save final section content
-    if current_content:
-        sections[current_section] = '\n'.join(current_content).strip()
-    
-    return sections
+    try:
+        if isinstance(pdf, bytes):
+            doc = pymupdf.open(stream=pdf, filetype="pdf")
+        else:
+            doc = pymupdf.open(pdf, filetype="pdf")
+        
+        with doc:
+            # Extract text from pages up to max_pages
+            return '\n'.join(doc[i].get_text("text") for i in range(min(len(doc), max_pages)))
+    except Exception as e:
+        return f"Error extracting PDF text: {str(e)}"
 
 
-# Sectioning logic
-def _identify_section_headers(text: str) -> Dict[str, Tuple[int, int]]:
+def _section_pdf_content(pdf: Union[bytes, str], max_pages: int = 40) -> SectionedText:
     """
-    Identify section headers and their positions in text.
-    
-    Handles synonyms like "Materials and Methods" for "Methods".
+    Section PDF text (from bytes or a file path) into standard sections.
     """
-    headers = {}
+    # Extract text from PDF
+    text = _extract_pdf_text(pdf, max_pages)
     
-    # Look for section headers in the text
-    lines = text.split('\n')
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if line:
-            # Check if line matches any section header or synonym
-            section_name = _map_section_headers(line)
-            if section_name:
-                headers[section_name] = (i, len(line))
+    # PDF text has no HTML structure: strip every line and drop blank ones
+    # up front, then section it like HTML text
+    text = _BLANK_LINE_RE.sub('\n', text).strip()
     
-    return headers
+    return _section_text(text)
 
 
+# Sectioning logic
 def _map_section_headers(header: str) -> Optional[str]:
     """
     Map non-standard section headers to standard sections.
@@ -384,11 +667,22 @@ def _map_section_headers(header: str) -> Optional[str]:
     - "Results and Discussion" -> "results" or "discussion"
     - "Background" -> "introduction"
     """
-    header_lower = header.lower().strip()
+    # Callers pass stripped lines
+    header_lower = header.lower()
     
     # Remove common prefixes/suffixes
-    header_lower = re.sub(r'^\d+\s*', '', header_lower)  # Remove leading numbers
-    header_lower = re.sub(r'\s*[:\-].*$', '', header_lower)  # Remove trailing colon/content
+    header_lower = _LEADING_NUMBER_RE.sub('', header_lower)  # Remove leading numbers
+    header_lower = _TRAILING_CONTENT_RE.sub('', header_lower)  # Remove trailing colon/content
+    
+    # Headers are usually spelled exactly like a synonym
+    section = _SYN_TO_CANON.get(header_lower)
+    if section:
+        return section
+    
+    # Most lines are body text: one longer than every synonym can only match
+    # by containing one, so a single scan rejects it without the loop below
+    if len(header_lower) > _MAX_SYNONYM_LEN and not _SYNONYM_RE.search(header_lower):
+        return None
     
     # Check each section and its synonyms
     for section, synonyms in SECTION_SYNONYMS.items():
@@ -409,9 +703,7 @@ def _join_hyphenated_words(text: str) -> str:
     """
     Join hyphenated words that were split across lines.
     """
-    # Pattern to match hyphenated words at end of line
-    pattern = r'(\w+)-\s*\n\s*(\w+)'
-    return re.sub(pattern, r'\1\2', text)
+    return _HYPHENATED_RE.sub(r'\1\2', text)
 
 
 def _clean_whitespace(text: str) -> str:
@@ -419,7 +711,7 @@ def _clean_whitespace(text: str) -> str:
     Normalize whitespace in text.
     """
     # Replace multiple whitespace characters with single space
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     # Remove leading/trailing whitespace
     return text.strip()
 
@@ -428,12 +720,10 @@ def _remove_figures_and_tables(text: str) -> str:
     """
     Remove figure and table references/descriptions.
     """
-    # Remove figure references
-    text = re.sub(r'Figure\s+\d+[A-Za-z]?(?:\s*[:\-].*?)?(?=\n|$)', '', text, flags=re.IGNORECASE)
-    # Remove table references
-    text = re.sub(r'Table\s+\d+[A-Za-z]?(?:\s*[:\-].*?)?(?=\n|$)', '', text, flags=re.IGNORECASE)
+    # Remove figure and table references
+    text = _FIGURE_TABLE_REF_RE.sub('', text)
     # Remove figure/table captions
-    text = re.sub(r'(?:Fig\.|Figure|Table)\s*\d+[A-Za-z]?.*?(?=\n\n|$)', '', text, flags=re.DOTALL | re.IGNORECASE)
+    text = _CAPTION_RE.sub('', text)
     
     return text
 
@@ -443,12 +733,50 @@ def _estimate_tokens(text: str) -> int:
     """
     Estimate token count for text.
     
-    Uses rough estimate: 1 token ≈ 4 chars in English.
+    Counts with tiktoken when available, else uses rough estimate:
+    1 token ≈ 4 chars in English.
     """
-    return len(text) // 4
+    return _estimate_tokens_batch([text])[0]
 
 
-def _allocate_token_budget(max_tokens: int) -> Dict[str, int]:
+def _estimate_tokens_batch(texts: List[str]) -> List[int]:
+    """
+    Token counts for many texts, encoded in one batch when tiktoken is available.
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return [len(text) // 4 for text in texts]
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """
+    The cl100k_base tiktoken encoding, loaded on first use.
+    
+    Returns None without tiktoken, or when its BPE file can't be fetched
+    (it is downloaded on first use), so callers fall back to len // 4.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut text to roughly max_tokens tokens (exactly, with tiktoken).
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        # Approximate how much of the paragraph we can include
+        return text[:max_tokens * 4]
+    return encoding.decode(encoding.encode_ordinary(text)[:max_tokens])
+
+
+def _allocate_token_budget(max_tokens: int) -> Mapping[str, int]:
     """
     Allocate token budget across sections.
     
@@ -459,21 +787,37 @@ def _allocate_token_budget(max_tokens: int) -> Dict[str, int]:
     - Results: 35%
     - Discussion: 15%
     - Conclusion: 5%
+    
+    Shares are integer percentages (no float rounding), cached per budget.
+    """
+    return _token_budget_table(int(max_tokens))
+
+
+@functools.lru_cache(maxsize=32)
+def _token_budget_table(max_tokens: int) -> Mapping[str, int]:
+    """
+    Read-only per-section shares of an integer token budget.
+    """
+    return MappingProxyType({
+        section: max_tokens * percent // 100
+        for section, percent in TOKEN_BUDGET_PERCENT.items()
+    })
+
+
+@functools.lru_cache(maxsize=8)
+def _key_terms_re(key_terms: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile key terms and the decimal-number pattern into one alternation.
     """
-    return {
-        "abstract": int(max_tokens * 0.10),
-        "introduction": int(max_tokens * 0.10),
-        "methods": int(max_tokens * 0.25),
-        "results": int(max_tokens * 0.35),
-        "discussion": int(max_tokens * 0.15),
-        "conclusion": int(max_tokens * 0.05)
-    }
+    terms = '|'.join(re.escape(term) for term in key_terms)
+    return re.compile(terms + r'|\d+\.\d+' if terms else r'\d+\.\d+', re.IGNORECASE)
 
 
 def _select_excerpts_from_section(
     section_text: str,
     allocated_tokens: int,
-    key_terms: List[str]
+    key_terms: List[str],
+    redundancy_penalty: float = 0.0
 ) -> str:
     """
     Select relevant excerpts from a section.
@@ -486,6 +830,9 @@ def _select_excerpts_from_section(
     - Blinding/allocation mentions
     - Sample size references
     - Attrition/dropout information
+    
+    With a redundancy_penalty, near-duplicates of paragraphs already picked
+    are ranked down (see _rank_with_redundancy_penalty).
     """
     if not section_text:
         return ""
@@ -496,43 +843,91 @@ def _select_excerpts_from_section(
     # Calculate tokens per paragraph budget
     avg_paragraph_tokens = allocated_tokens // max(len(paragraphs), 1)
     
-    # Score paragraphs based on key terms
-    scored_paragraphs = []
+    # Score paragraphs based on key terms: one point per distinct term, plus
+    # a bonus for numbers (likely effect estimates, p-values, etc.), all
+    # found in a single scan. Token counts are computed once, alongside.
+    key_terms_re = _key_terms_re(tuple(key_terms))
+    tokens = _estimate_tokens_batch(paragraphs)
+    scores = []
     for paragraph in paragraphs:
-        score = 0
-        paragraph_lower = paragraph.lower()
-        
-        # Score based on key terms
-        for term in key_terms:
-            if term in paragraph_lower:
-                score += 1
-        
-        # Bonus for numbers (likely effect estimates, p-values, etc.)
-        if re.search(r'\d+\.\d+', paragraph):
-            score += 0.5
-        
-        scored_paragraphs.append((paragraph, score))
+        hits = {hit.lower() for hit in key_terms_re.findall(paragraph)}
+        numbers = sum(1 for hit in hits if hit[0].isdigit())
+        scores.append(len(hits) - numbers + (0.5 if numbers else 0))
     
-    # Sort by score (descending)
-    scored_paragraphs.sort(key=lambda x: x[1], reverse=True)
+    # Rank paragraph indices by score (descending, ties in text order);
+    # scores and token counts stay in flat parallel lists
+    order = sorted(range(len(paragraphs)), key=scores.__getitem__, reverse=True)
+    if redundancy_penalty > 0 and len(order) > 1:
+        order = _rank_with_redundancy_penalty(paragraphs, scores, order, redundancy_penalty)
     
-    # Select paragraphs within token budget
-    selected_paragraphs = []
-    current_tokens = 0
+    # Paragraphs are taken in rank order until the first one that doesn't
+    # fit, so the selection is the longest prefix whose running token total
+    # stays within budget
+    running_tokens = list(itertools.accumulate(tokens[i] for i in order))
+    fitted = bisect.bisect_right(running_tokens, allocated_tokens)
+    selected_paragraphs = [paragraphs[i] for i in order[:fitted]]
     
-    for paragraph, score in scored_paragraphs:
-        paragraph_tokens = _estimate_tokens(paragraph)
-        if current_tokens + paragraph_tokens <= allocated_tokens:
-            selected_paragraphs.append(paragraph)
-            current_tokens += paragraph_tokens
-        else:
-            # If we can't fit the whole paragraph, try to fit a part of it
-            remaining_tokens = allocated_tokens - current_tokens
-            if remaining_tokens > 10:  # Minimum for a meaningful excerpt
-                # Approximate how much of the paragraph we can include
-                chars_to_include = remaining_tokens * 4
-                truncated_paragraph = paragraph[:chars_to_include] + "..."
-                selected_paragraphs.append(truncated_paragraph)
-            break
+    if fitted < len(order):
+        # If we can't fit the whole paragraph, try to fit a part of it
+        remaining_tokens = allocated_tokens - (running_tokens[fitted - 1] if fitted else 0)
+        if remaining_tokens > 10:  # Minimum for a meaningful excerpt
+            truncated_paragraph = _truncate_to_tokens(paragraphs[order[fitted]], remaining_tokens) + "..."
+            selected_paragraphs.append(truncated_paragraph)
+    
+    return '\n\n'.join(selected_paragraphs)
+
+
+def _rank_with_redundancy_penalty(
+    paragraphs: List[str],
+    scores: List[float],
+    order: List[int],
+    penalty: float
+) -> List[int]:
+    """
+    Reorder score-ranked paragraph indices by marginal gain (maximal marginal relevance).
+    
+    Each pick maximizes score - penalty * (summed cosine similarity to the
+    paragraphs picked so far), over TF-IDF word vectors. Similarities are
+    accumulated as picks are made, so each step is one pass over the rest.
+    """
+    vectors = _tfidf_vectors(paragraphs)
+    redundancy = [0.0] * len(paragraphs)
+    remaining = list(order)
+    ranked = []
+    
+    while remaining:
+        best = max(remaining, key=lambda i: scores[i] - penalty * redundancy[i])
+        remaining.remove(best)
+        ranked.append(best)
+        for i in remaining:
+            redundancy[i] += _cosine(vectors[i], vectors[best])
     
-    return '\n\n'.join(selected_paragraphs)
\ No newline at end of file
+    return ranked
+
+
+def _tfidf_vectors(paragraphs: List[str]) -> List[Dict[str, float]]:
+    """
+    Unit-length TF-IDF vectors (as sparse dicts) for a section's paragraphs.
+    """
+    counts = [Counter(_WORD_RE.findall(paragraph.lower())) for paragraph in paragraphs]
+    document_frequency = Counter(term for count in counts for term in count)
+    n = len(paragraphs)
+    
+    vectors = []
+    for count in counts:
+        vector = {
+            term: tf * (math.log(n / document_frequency[term]) + 1.0)
+            for term, tf in count.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        vectors.append({term: weight / norm for term, weight in vector.items()})
+    return vectors
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """
+    Dot product of two unit-length sparse vectors.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
\ No newline at end of file
@@ -1,7 +1,14 @@
+from functools import lru_cache
 from pathlib import Path
+import os
 from pydantic import BaseModel
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 class AppConfig(BaseModel):
     paths: dict
     llm: dict | None = None
@@ -9,6 +16,15 @@ class AppConfig(BaseModel):
     appraisal: dict | None = None
 
 def load_yaml(path: str | Path) -> AppConfig:
+    # Parsed configs are reused until the file changes (mtime or size, for
+    # coarse mtime clocks); callers get a copy so mutating one can't leak
+    # into the cache
+    stat = os.stat(path)
+    cfg = _load_yaml_cached(os.fspath(path), stat.st_mtime_ns, stat.st_size)
+    return cfg.model_copy(deep=True)
+
+@lru_cache(maxsize=8)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> AppConfig:
     with open(path, "r", encoding="utf-8") as f:
-        raw = yaml.safe_load(f) or {}
+        raw = yaml.load(f, Loader=_Loader) or {}
     return AppConfig(**raw)
\ No newline at end of file
@@ -1,5 +1,17 @@
 from pathlib import Path
+import atexit
 import logging
+import logging.handlers
+import queue
+
+class _LazyFileHandler(logging.FileHandler):
+    # Opened (and its directory created) on the first record, not at setup
+    def __init__(self, filename: str, encoding: str | None = None):
+        super().__init__(filename, encoding=encoding, delay=True)
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
 
 def setup_logger(name: str = "podcast", level: int = logging.INFO) -> logging.Logger:
     logger = logging.getLogger(name)
@@ -8,9 +20,12 @@ def setup_logger(name: str = "podcast", level: int = logging.INFO) -> logging.Lo
     logger.setLevel(level)
     ch = logging.StreamHandler()
     ch.setFormatter(logging.Formatter("[%(levelname)s] %(asctime)s - %(name)s: %(message)s"))
-    logger.addHandler(ch)
-    Path("logs").mkdir(exist_ok=True)
-    fh = logging.FileHandler("logs/podcast.log", encoding="utf-8")
+    fh = _LazyFileHandler("logs/podcast.log", encoding="utf-8")
     fh.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
-    logger.addHandler(fh)
+    # Callers only enqueue records; one listener thread does the console and file I/O
+    q = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(q))
+    listener = logging.handlers.QueueListener(q, ch, fh, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     return logger
\ No newline at end of file
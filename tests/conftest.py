@@ -0,0 +1,10 @@
+"""Shared pytest setup: make the pipeline step packages importable."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+for src in (ROOT / "pipelines" / "step1" / "src", ROOT / "pipelines" / "step2" / "src"):
+    if str(src) not in sys.path:
+        sys.path.insert(0, str(src))
@@ -0,0 +1,50 @@
+"""Round-trip tests for the step1 candidate file handoff."""
+
+import json
+
+from step1.cli import load_articles, save_articles
+from step1.model import Article
+
+
+def _article(**overrides) -> Article:
+    fields = dict(
+        title="Régional anesthesia RCT",
+        abstract="Patients were randomly assigned to placebo.",
+        authors=["Doe J", "Smith A"],
+        journal="Anesthesiology",
+        year=2024,
+        pub_date="2024-03-01",
+        pmid="12345",
+        doi="10.1000/xyz",
+        url="https://pubmed.ncbi.nlm.nih.gov/12345/",
+        language="english",
+        mesh_terms=["Anesthesia", "Humans"],
+        trial_design="RCT",
+        sample_size=120,
+        multicenter=True,
+        intervention="Nerve block",
+        comparator="Placebo",
+        primary_outcome="Pain score",
+        score=7.5,
+        rationale="High quality",
+    )
+    fields.update(overrides)
+    return Article(**fields)
+
+
+def test_save_then_load_round_trips_fields(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    articles = [
+        _article(),
+        _article(pmid="67890", doi=None, sample_size=None, multicenter=None, score=None),
+    ]
+
+    save_articles(articles, "candidates.json")
+    loaded = load_articles("candidates.json")
+
+    assert loaded == articles
+    assert (tmp_path / "data" / "candidates.msgpack").exists()
+    # The human-readable JSON copy carries the same records
+    on_disk = json.loads((tmp_path / "data" / "candidates.json").read_text(encoding="utf-8"))
+    assert [Article(**record) for record in on_disk] == articles
@@ -0,0 +1,180 @@
+"""Behavior tests for step1 filtering and deduplication."""
+
+import random
+
+import pytest
+
+from step1 import filters
+from step1.model import Article
+
+# Vocabulary mixing keywords from every filter (in varied case) with filler
+WORDS = (
+    filters.RCT_ABSTRACT_KEYWORDS
+    + filters.RCT_TITLE_KEYWORDS
+    + filters.HUMAN_KEYWORDS
+    + filters.ANIMAL_KEYWORDS
+    + filters.ANESTHESIA_KEYWORDS
+    + filters.PROTOCOL_KEYWORDS
+    + filters.PEDIATRIC_KEYWORDS
+    + ["Randomized", "PLACEBO", "Mice", "operatively", "trial", "outcome", "the", "of"]
+)
+
+
+def make_article(**overrides) -> Article:
+    fields = dict(
+        title="",
+        abstract="",
+        authors=[],
+        journal="J",
+        year=2024,
+        pub_date="2024-01-01",
+        pmid="1",
+        doi=None,
+        url="",
+        language="English",
+        mesh_terms=[],
+        trial_design="",
+        intervention="",
+        comparator="",
+        primary_outcome="",
+    )
+    fields.update(overrides)
+    return Article(**fields)
+
+
+def random_article(rng: random.Random, identifiers: int) -> Article:
+    def text(n):
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, n)))
+
+    pmid = str(rng.randrange(identifiers))
+    return make_article(
+        title=text(4),
+        abstract=text(12),
+        pmid=pmid,
+        doi=rng.choice([None, f"10.1000/{pmid}", f"10.1000/{rng.randrange(identifiers)}"]),
+        language=rng.choice(["English", "french", "German"]),
+        mesh_terms=[text(2) for _ in range(rng.randint(0, 3))],
+    )
+
+
+# Baseline substring predicates the compiled-regex filters must match
+def _contains_any(text, keywords):
+    return any(k in text.lower() for k in keywords)
+
+
+def baseline_is_rct(a):
+    if _contains_any(a.title, filters.RCT_TITLE_KEYWORDS):
+        return True
+    abstract = a.abstract.lower()
+    return sum(1 for k in filters.RCT_ABSTRACT_KEYWORDS if k in abstract) >= 2
+
+
+def baseline_is_human(a):
+    mesh = " ".join(a.mesh_terms)
+    if _contains_any(mesh, filters.ANIMAL_KEYWORDS) and not _contains_any(
+        mesh, filters.HUMAN_KEYWORDS
+    ):
+        return False
+    text = a.title + " " + a.abstract
+    human = _contains_any(text, filters.HUMAN_KEYWORDS)
+    animal = _contains_any(text, filters.ANIMAL_KEYWORDS)
+    if animal and not human:
+        return False
+    return human or not animal
+
+
+def baseline_is_anesthesia(a):
+    return any(_contains_any(t, filters.ANESTHESIA_KEYWORDS) for t in a.mesh_terms) or (
+        _contains_any(a.title + " " + a.abstract, filters.ANESTHESIA_KEYWORDS)
+    )
+
+
+def baseline_is_protocol(a, allow_protocols):
+    return not allow_protocols and _contains_any(
+        a.title + " " + a.abstract, filters.PROTOCOL_KEYWORDS
+    )
+
+
+def baseline_is_pediatric(a, allow_pediatric):
+    return not allow_pediatric and _contains_any(
+        a.title + " " + a.abstract, filters.PEDIATRIC_KEYWORDS
+    )
+
+
+@pytest.mark.parametrize("allow_protocols", [False, True])
+@pytest.mark.parametrize("allow_pediatric", [False, True])
+def test_predicates_match_baseline(monkeypatch, allow_protocols, allow_pediatric):
+    monkeypatch.setattr(filters.settings, "allow_protocols", allow_protocols)
+    monkeypatch.setattr(filters.settings, "allow_pediatric", allow_pediatric)
+    rng = random.Random(1234)
+
+    for _ in range(2000):
+        a = random_article(rng, identifiers=10**6)
+        expected = {
+            "rct": baseline_is_rct(a),
+            "human": baseline_is_human(a),
+            "anesthesia": baseline_is_anesthesia(a),
+            "language": a.language.lower() in ["english", "french"],
+            "protocol": baseline_is_protocol(a, allow_protocols),
+            "pediatric": baseline_is_pediatric(a, allow_pediatric),
+        }
+        actual = {
+            "rct": filters.is_rct_article(a),
+            "human": filters.is_human_study(a),
+            "anesthesia": filters.is_anesthesia_related(a),
+            "language": filters.is_preferred_language(a),
+            "protocol": filters.is_protocol_or_letter(a),
+            "pediatric": filters.is_pediatric_only(a),
+        }
+        assert actual == expected, a
+        assert filters._passes_all_filters(a) == (
+            expected["rct"]
+            and expected["human"]
+            and expected["anesthesia"]
+            and expected["language"]
+            and not expected["protocol"]
+            and not expected["pediatric"]
+        ), a
+
+
+def test_deduplicate_keys_on_doi_or_pmid_first_wins():
+    first = make_article(pmid="1", doi="10.1/a", title="first")
+    same_doi = make_article(pmid="2", doi="10.1/a", title="same doi")
+    pmid_only = make_article(pmid="3", title="pmid only")
+    same_pmid = make_article(pmid="3", title="same pmid")
+    no_identifier = make_article(pmid="", title="no identifier")
+
+    unique = filters.deduplicate_articles([first, same_doi, pmid_only, same_pmid, no_identifier])
+
+    assert [a.title for a in unique] == ["first", "pmid only"]
+
+
+def test_deduplicate_pmid_does_not_collide_with_other_records_doi_pmid():
+    # Keyed on doi or pmid: a DOI record's PMID is not its identifier
+    with_doi = make_article(pmid="42", doi="10.1/a")
+    pmid_only = make_article(pmid="42")
+
+    assert filters.deduplicate_articles([with_doi, pmid_only]) == [with_doi, pmid_only]
+
+
+def test_filter_keeps_later_duplicate_when_first_fails():
+    passing = dict(
+        title="Randomized trial of nerve block",
+        abstract="patients received placebo",
+    )
+    failing = make_article(pmid="1", title="Letter", abstract="editorial on mice")
+    other = make_article(pmid="2", **passing)
+    later = make_article(pmid="1", **passing)
+
+    assert filters.filter_articles([failing, other, later]) == [other, later]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_filter_matches_filter_then_dedupe(seed):
+    rng = random.Random(seed)
+    articles = [random_article(rng, identifiers=60) for _ in range(300)]
+
+    passed = [a for a in articles if filters._passes_all_filters(a)]
+    expected = filters.deduplicate_articles(passed)
+
+    assert filters.filter_articles(articles) == expected
@@ -0,0 +1,58 @@
+"""Tests for parsing PubMed EFetch XML."""
+
+from pathlib import Path
+
+import msgspec
+import pytest
+
+from step1.clients.pubmed import PubMedClient
+from step1.model import Article
+
+FIXTURE = Path(__file__).parent / "fixtures" / "efetch_sample.xml"
+
+
+@pytest.fixture(scope="module")
+def payload() -> bytes:
+    return FIXTURE.read_bytes()
+
+
+def test_parse_efetch_xml_extracts_fields(payload):
+    first, second = PubMedClient()._parse_efetch_xml([payload])
+
+    assert first == {
+        "pmid": "38000001",
+        "title": "Nerve block versus placebo: a randomized controlled trial.",
+        "abstract": "Patients were randomly assigned to a nerve block or placebo.",
+        "authors": ["Jane Doe", "Collaborators"],
+        "journal": "Anesthesiology",
+        "year": 2024,
+        "pub_date": "2024",
+        "doi": "10.1000/anes.2024.001",
+        "url": "https://pubmed.ncbi.nlm.nih.gov/38000001/",
+        "language": "eng",
+        "mesh_terms": ["Anesthesia", "Humans"],
+        "trial_design": "",
+        "intervention": "",
+        "comparator": "",
+        "primary_outcome": "",
+    }
+    # MedlineDate year, missing abstract, and no DOI picked up from references
+    assert second["pmid"] == "38000002"
+    assert (second["year"], second["pub_date"]) == (2023, "2023")
+    assert second["abstract"] == ""
+    assert second["doi"] is None
+
+
+def test_parse_efetch_xml_is_independent_of_chunking(payload):
+    client = PubMedClient()
+    chunks = [payload[i : i + 64] for i in range(0, len(payload), 64)]
+
+    assert client._parse_efetch_xml(chunks) == client._parse_efetch_xml([payload])
+
+
+def test_parsed_records_match_article_schema(payload):
+    required = {field.name for field in msgspec.structs.fields(Article) if field.required}
+
+    for record in PubMedClient()._parse_efetch_xml([payload]):
+        assert required <= record.keys() <= set(Article.__struct_fields__)
+        assert msgspec.convert(record, Article).pmid == record["pmid"]
@@ -0,0 +1,101 @@
+"""Tests for the step1 selection history and its Bloom filter."""
+
+import json
+
+import pytest
+
+from step1 import select
+from step1.bloom import BloomFilter
+from step1.model import Article
+
+
+@pytest.fixture(autouse=True)
+def history_paths(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    monkeypatch.setattr(select, "HISTORY_FILE", data / "selection_history.jsonl")
+    monkeypatch.setattr(select, "LEGACY_HISTORY_FILE", data / "selection_history.json")
+    monkeypatch.setattr(select, "HISTORY_BLOOM_FILE", data / "selection_history.bloom")
+    return data
+
+
+def make_article(pmid: str, doi=None, score: float = 5.0) -> Article:
+    return Article(
+        title=f"Trial {pmid}",
+        abstract="",
+        authors=[],
+        journal="J",
+        year=2024,
+        pub_date="2024",
+        pmid=pmid,
+        doi=doi,
+        url="",
+        language="english",
+        mesh_terms=[],
+        trial_design="",
+        intervention="",
+        comparator="",
+        primary_outcome="",
+        score=score,
+        rationale="good",
+    )
+
+
+def test_bloom_filter_round_trips_through_bytes():
+    bloom = BloomFilter()
+    bloom.add("doi:10.1/a")
+
+    reloaded = BloomFilter(bits=bloom.to_bytes())
+
+    assert "doi:10.1/a" in reloaded
+    assert "doi:10.1/b" not in reloaded
+    with pytest.raises(ValueError):
+        BloomFilter(bits=b"\x00")
+
+
+def test_recorded_article_is_hit_after_reload():
+    chosen = make_article("1", doi="10.1/a")
+    other = make_article("2", score=1.0)
+
+    select.record_selected_article(chosen, "rationale")
+
+    assert select.HISTORY_BLOOM_FILE.exists()
+    history_filter = select.load_history_filter()
+    assert select.is_article_previously_selected(chosen, history_filter)
+    assert not select.is_article_previously_selected(other, history_filter)
+    # The higher-scored article was already selected, so the next one is picked
+    assert select.select_top_article([chosen, other])[0] is other
+
+
+def test_missing_bloom_file_is_rebuilt_from_history():
+    select.record_selected_article(make_article("1", doi="10.1/a"), "rationale")
+    select.HISTORY_BLOOM_FILE.unlink()
+
+    history_filter = select.load_history_filter()
+
+    assert "doi:10.1/a" in history_filter and "pmid:1" in history_filter
+    assert select.HISTORY_BLOOM_FILE.exists()
+
+
+def test_legacy_json_history_migrates_to_jsonl(history_paths):
+    legacy = [
+        {"title": "Old", "doi": "10.1/old", "pmid": "9", "score": 8.0},
+        {"title": "Ünïcode", "doi": None, "pmid": "10", "score": None},
+    ]
+    history_paths.mkdir()
+    select.LEGACY_HISTORY_FILE.write_text(json.dumps(legacy), encoding="utf-8")
+
+    assert select.load_selection_history() == legacy
+    lines = select.HISTORY_FILE.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == legacy
+
+    # Appends go to the JSONL file; the legacy file is not read again
+    select.append_selection_history({"title": "New", "doi": None, "pmid": "11"})
+    select.LEGACY_HISTORY_FILE.write_text("[]", encoding="utf-8")
+    assert [entry["title"] for entry in select.load_selection_history()] == [
+        "Old",
+        "Ünïcode",
+        "New",
+    ]
+    assert select.is_article_previously_selected(
+        make_article("12", doi="10.1/old"), select.load_history_filter()
+    )